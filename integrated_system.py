@@ -1,20 +1,188 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.font_manager as fm
+import importlib
+import functools
 import os
 import tempfile
+import hashlib
+import shutil
+import re
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextlib import contextmanager
 from datetime import datetime
-import seaborn as sns
 import random
 
+# Reference point of --startup-profile (the standard library and tkinter are imported by now)
+STARTUP_TIME = time.perf_counter()
+
+# Seconds and loading thread of every deferred import, in load order
+IMPORT_TIMES = OrderedDict()
+
+
+class LazyModule:
+    """Stand-in for a heavy module that is imported on first use (or by preload_modules)
+    
+    The first attribute access imports the module, runs its setup function and
+    rebinds the module-level alias to the real module, so later lookups go
+    straight to it.
+    """
+    def __init__(self, alias, name, setup=None):
+        self.alias = alias
+        self.name = name
+        self.setup = setup
+        self.lock = threading.Lock()
+    
+    def load(self):
+        with self.lock:
+            module = globals()[self.alias]
+            if module is self:
+                started = time.perf_counter()
+                module = importlib.import_module(self.name)
+                if self.setup:
+                    self.setup(module)
+                IMPORT_TIMES[self.name] = (time.perf_counter() - started, threading.current_thread().name)
+                globals()[self.alias] = module
+            return module
+    
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+def configure_matplotlib(pyplot):
+    """Default English fonts for plots"""
+    # Arial first in the sans-serif list: used where installed, silent fallback elsewhere
+    pyplot.rcParams["font.family"] = "sans-serif"
+    pyplot.rcParams["font.sans-serif"] = ["Arial"] + [font for font in pyplot.rcParams["font.sans-serif"] if font != "Arial"]
+    pyplot.rcParams["axes.unicode_minus"] = False  # Fix minus sign display
+
+
+# Heavy modules are imported on first use so the main window appears immediately
+np = LazyModule("np", "numpy")
+pd = LazyModule("pd", "pandas")
+plt = LazyModule("plt", "matplotlib.pyplot", setup=configure_matplotlib)
+sns = LazyModule("sns", "seaborn")
+
+# Imported by the background preload: only packages that never touch the GUI backend.
+# pyplot and seaborn (which configures pyplot) load on first use, on the main thread.
+PRELOAD_MODULES = [np, pd, "reportlab.pdfgen.canvas", "reportlab.lib.utils"]
+
+
+def preload_modules(on_done=None):
+    """Import the backend-independent deferred modules in a background thread (e.g. once the window is painted)"""
+    def preload():
+        for module in PRELOAD_MODULES:
+            if isinstance(module, str):
+                started = time.perf_counter()
+                importlib.import_module(module)
+                IMPORT_TIMES[module] = (time.perf_counter() - started, threading.current_thread().name)
+            elif globals()[module.alias] is module:
+                module.load()
+        if on_done:
+            on_done()
+    
+    thread = threading.Thread(target=preload, name="preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def startup_report(painted=None):
+    """Text of the --startup-profile report: window paint time and the cost of each deferred import"""
+    lines = ["Startup profile (seconds after module import):"]
+    if painted is not None:
+        lines.append(f"  {'window painted':<32}{painted:8.3f}")
+    for name, (seconds, thread) in IMPORT_TIMES.items():
+        where = "background preload" if thread == "preload" else f"on first use ({thread})"
+        lines.append(f"  {'import ' + name:<32}{seconds:8.3f}  {where}")
+    lines.append(f"  {'total':<32}{time.perf_counter() - STARTUP_TIME:8.3f}")
+    return "\n".join(lines)
+
+
+class PerformanceTracer:
+    """Timing spans of the hot paths (parsing, statistics, chart drawing, canvas draws, table updates)
+    
+    span() is a context manager; spans nest per thread, and every outermost
+    span (one user action, background job or chart render) is kept as a run
+    together with its nested phases. The last max_runs runs are kept and can
+    be exported as a Chrome trace (chrome://tracing, Perfetto).
+    """
+    def __init__(self, max_runs=200):
+        self.runs = deque(maxlen=max_runs)
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.origin = time.perf_counter()
+    
+    @contextmanager
+    def span(self, name, **args):
+        stack = self.local.__dict__.setdefault("stack", [])
+        thread = threading.current_thread()
+        record = {"name": name, "start": time.perf_counter(), "end": None, "args": args,
+                  "thread": thread.ident, "thread_name": thread.name, "children": []}
+        if stack:
+            stack[-1]["children"].append(record)
+        stack.append(record)
+        try:
+            yield record
+        finally:
+            record["end"] = time.perf_counter()
+            stack.pop()
+            if not stack:
+                with self.lock:
+                    self.runs.append(record)
+    
+    def last_runs(self):
+        """Finished runs, newest first"""
+        with self.lock:
+            return list(reversed(self.runs))
+    
+    def clear(self):
+        with self.lock:
+            self.runs.clear()
+    
+    def chrome_trace(self):
+        """All kept spans in Chrome trace event format (complete events, microseconds)"""
+        events = []
+        threads = {}
+        
+        def add(record):
+            threads[record["thread"]] = record["thread_name"]
+            events.append({
+                "name": record["name"], "cat": "grade-analysis", "ph": "X", "pid": os.getpid(),
+                "tid": record["thread"], "ts": (record["start"] - self.origin) * 1e6,
+                "dur": (record["end"] - record["start"]) * 1e6,
+                "args": {key: str(value) for key, value in record["args"].items()}
+            })
+            for child in record["children"]:
+                add(child)
+        
+        for run in reversed(self.last_runs()):
+            add(run)
+        for tid, name in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+    
+    def export_chrome_trace(self, file_path):
+        import json
+        
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+# Spans of the whole application, shown in the Performance tab
+TRACER = PerformanceTracer()
+
+
+def traced(name):
+    """Method decorator recording every call as a span of TRACER"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with TRACER.span(name):
+                return method(*args, **kwargs)
+        return wrapper
+    return decorate
 
-# Configure default English fonts for plots
-plt.rcParams["font.family"] = "Arial"
-plt.rcParams["axes.unicode_minus"] = False  # Fix minus sign display
 
 # English names for random generation
 FIRST_NAMES = ["James", "John", "Robert", "Michael", "William", "David", "Richard", "Joseph", "Thomas", "Charles",
@@ -45,11 +213,24 @@ SUBJECTS = [
     {"name": "Current Affairs", "min": 0, "max": 100, "pass_score": 60, "pass_rate": 60}
 ]
 
+# Above this many students the scatter plot matrix draws 2D-binned density images instead of markers
+SCATTER_DENSITY_THRESHOLD = 20000
+
+# Records each generator worker process should get before a process pool pays
+# off (below this, process start-up and pickling chunks back cost more than it saves)
+PARALLEL_MIN_RECORDS = 500000
+
+# Charts each rendering worker process should get: starting a spawned worker took
+# about 1.2 s in measurements, rendering one chart at 150 dpi 0.3-0.8 s
+RENDER_FIGURES_PER_WORKER = 4
+
 class StudentDataGenerator:
     """Student Data Generator Class"""
-    def __init__(self, parent):
+    def __init__(self, parent=None, on_use=None):
         self.parent = parent
         self.window = None
+        # Called with the generated DataFrame by "Use for Analysis"
+        self.on_use = on_use
         
         # Variables to store subject settings
         self.subject_vars = {}
@@ -95,7 +276,7 @@ class StudentDataGenerator:
         # Student count setting
         ttk.Label(settings_frame, text="Student Count:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
         self.student_count = tk.IntVar(value=50)
-        ttk.Spinbox(settings_frame, from_=1, to=1000, textvariable=self.student_count, width=10).grid(
+        ttk.Spinbox(settings_frame, from_=1, to=1000000, textvariable=self.student_count, width=10).grid(
             row=0, column=1, padx=5, pady=5, sticky=tk.W)
         
         # Student ID prefix setting
@@ -111,6 +292,16 @@ class StudentDataGenerator:
         class_combo['values'] = ["Random Assignment"] + CLASSES
         class_combo.grid(row=0, column=5, padx=5, pady=5, sticky=tk.W)
         
+        # Fast (NumPy) generation mode and random seed
+        self.vectorized = tk.BooleanVar(value=True)
+        ttk.Checkbutton(settings_frame, text="Fast Mode (NumPy)", variable=self.vectorized).grid(
+            row=1, column=0, columnspan=2, padx=5, pady=5, sticky=tk.W)
+        
+        ttk.Label(settings_frame, text="Random Seed:").grid(row=1, column=2, padx=5, pady=5, sticky=tk.W)
+        self.seed = tk.StringVar(value="")
+        ttk.Entry(settings_frame, textvariable=self.seed, width=10).grid(
+            row=1, column=3, padx=5, pady=5, sticky=tk.W)
+        
         # Subject settings area
         subjects_frame = ttk.LabelFrame(main_frame, text="Subject Settings", padding="10")
         subjects_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
@@ -181,6 +372,8 @@ class StudentDataGenerator:
         
         ttk.Button(button_frame, text="Generate Data", command=self.generate_data).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Export Data", command=self.export_data).pack(side=tk.LEFT, padx=5)
+        if self.on_use is not None:
+            ttk.Button(button_frame, text="Use for Analysis", command=self.use_generated_data).pack(side=tk.LEFT, padx=5)
         ttk.Button(button_frame, text="Reset Settings", command=self.reset_settings).pack(side=tk.RIGHT, padx=5)
         
         # Result preview area
@@ -233,17 +426,14 @@ class StudentDataGenerator:
         min_val = self.subject_min[name].get()
         max_val = self.subject_max[name].get()
         pass_score = self.subject_pass[name].get()
-        pass_rate = self.subject_pass_rate[name].get() / 100
         
         # Ensure parameters are valid
         if min_val > max_val:
             min_val, max_val = max_val, min_val
         
-        # Calculate minimum required passing scores
-        min_pass_count = int(pass_rate * student_count)
-        # If result is 0 but pass rate > 0, guarantee at least 1 passing score
-        if min_pass_count == 0 and pass_rate > 0:
-            min_pass_count = 1
+        # Minimum required passing scores, with the same exact arithmetic as fast mode
+        min_pass_count = int(self.min_pass_counts(
+            [{"pass_rate": self.subject_pass_rate[name].get()}], student_count)[0])
         
         # First generate guaranteed passing scores
         scores = []
@@ -264,6 +454,227 @@ class StudentDataGenerator:
         random.shuffle(scores)
         return scores
     
+    def get_subject_settings(self):
+        """Collect selected subjects with the settings entered in the window"""
+        return [
+            {
+                "name": subj["name"],
+                "min": self.subject_min[subj["name"]].get(),
+                "max": self.subject_max[subj["name"]].get(),
+                "pass_score": self.subject_pass[subj["name"]].get(),
+                "pass_rate": self.subject_pass_rate[subj["name"]].get()
+            }
+            for subj in SUBJECTS if self.subject_vars[subj["name"]].get()
+        ]
+    
+    def get_rng(self):
+        """Create NumPy random generator from the seed setting (empty means random)"""
+        seed = self.seed.get().strip()
+        return np.random.default_rng(int(seed) if seed else None)
+    
+    def min_pass_counts(self, subjects, student_count):
+        """Minimum number of passing scores per subject for the configured pass rates"""
+        pass_rates = np.array([subj["pass_rate"] for subj in subjects])
+        min_pass = (pass_rates * student_count // 100).astype(np.int64)
+        # If result is 0 but pass rate > 0, guarantee at least 1 passing score
+        min_pass[(min_pass == 0) & (pass_rates > 0)] = 1
+        return np.minimum(min_pass, student_count)
+    
+    def generate_score_matrix(self, subjects, student_count, rng, min_pass=None):
+        """Generate the whole student x subject score matrix in one vectorized step
+        
+        Follows the same rules as generate_scores_for_subject: min_pass scores of
+        each subject are guaranteed to pass and the rest pass with 50% probability.
+        """
+        min_vals = np.array([subj["min"] for subj in subjects])
+        max_vals = np.array([subj["max"] for subj in subjects])
+        pass_scores = np.array([subj["pass_score"] for subj in subjects])
+        
+        # Ensure parameters are valid
+        low = np.minimum(min_vals, max_vals)
+        high = np.maximum(min_vals, max_vals)
+        
+        if min_pass is None:
+            min_pass = self.min_pass_counts(subjects, student_count)
+        
+        # Work subject-major so every shuffle runs over contiguous memory
+        passing = (np.arange(student_count) < min_pass[:, None]) | \
+            (rng.random((len(subjects), student_count)) < 0.5)
+        
+        # Shuffle the pass/fail pattern of each subject independently
+        passing = rng.permuted(passing, axis=1)
+        
+        # Passing scores come from [pass_score, max], failing ones from [min, pass_score - 1]
+        score_low = np.where(passing, pass_scores[:, None], low[:, None])
+        score_high = np.where(passing, high[:, None] + 1, np.maximum(pass_scores, low + 1)[:, None])
+        return rng.integers(score_low, score_high).T
+    
+    def generate_dataframe(self, count, id_prefix, class_range, subjects, rng,
+                           start=0, min_pass=None, classes=None):
+        """Generate student records with NumPy (vectorized mode)
+        
+        start is the index of the first record, so IDs and numbering continue
+        across chunks.
+        """
+        classes = CLASSES if classes is None else classes
+        numbers = np.arange(start + 1, start + count + 1)
+        full_names = np.array([f"{first} {last}" for first in FIRST_NAMES for last in LAST_NAMES], dtype=object)
+        data = {
+            "No.": numbers,
+            "Student ID": np.char.add(id_prefix, np.char.zfill(numbers.astype(str), 4)).astype(object),
+            "Name": full_names[rng.integers(0, len(full_names), count)]
+        }
+        if class_range == "Random Assignment":
+            data["Class"] = np.array(classes, dtype=object)[rng.integers(0, len(classes), count)]
+        else:
+            data["Class"] = np.full(count, class_range, dtype=object)
+        
+        scores = self.generate_score_matrix(subjects, count, rng, min_pass=min_pass)
+        for col, subj in enumerate(subjects):
+            data[subj["name"]] = scores[:, col]
+        
+        return pd.DataFrame(data)
+    
+    def generate_shard(self, shard_index, count, shard_size=100000, id_prefix="2023",
+                       class_range="Random Assignment", subjects=None, classes=None, seed=None):
+        """Generate one ID-range shard of a cohort of count students
+        
+        Shard shard_index covers records [shard_index * shard_size, ...). Every
+        shard draws from its own seed stream derived from seed, and the guaranteed
+        passing scores are spread over the shards so the whole cohort still meets
+        the configured pass rates. The result only depends on the shard, not on
+        which process generates it.
+        """
+        subjects = SUBJECTS if subjects is None else subjects
+        start = shard_index * shard_size
+        stop = min(start + shard_size, count)
+        total_min_pass = self.min_pass_counts(subjects, count)
+        min_pass = total_min_pass * stop // count - total_min_pass * start // count
+        
+        rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(shard_index,)))
+        return self.generate_dataframe(stop - start, id_prefix, class_range, subjects, rng,
+                                       start=start, min_pass=min_pass, classes=classes)
+    
+    @staticmethod
+    def shard_count(count, chunk_size):
+        """Number of chunks needed for count records (validates both arguments)"""
+        if count < 0:
+            raise ValueError(f"Student count must not be negative (got {count})")
+        if chunk_size <= 0:
+            raise ValueError(f"Chunk size must be greater than 0 (got {chunk_size})")
+        return -(-count // chunk_size)
+    
+    @staticmethod
+    def pool_size(count, shard_count, workers):
+        """Worker processes actually worth starting for count records
+        
+        Every worker gets at least PARALLEL_MIN_RECORDS records, so moderate
+        cohorts are generated in-process whatever workers asks for.
+        """
+        return max(1, min(workers, shard_count, count // PARALLEL_MIN_RECORDS))
+    
+    def generate_chunks(self, count, chunk_size=100000, workers=1, **settings):
+        """Generate student records as a sequence of DataFrames of at most chunk_size rows
+        
+        Works without the GUI. With workers > 1 the chunks are generated in a
+        process pool; they are still yielded in ID order and are identical to
+        the single-process output for the same seed and chunk_size.
+        """
+        # Fix the root entropy up front so every shard (and process) shares it
+        settings["seed"] = np.random.SeedSequence(settings.get("seed")).entropy
+        shard_count = self.shard_count(count, chunk_size)
+        workers = self.pool_size(count, shard_count, workers)
+        
+        if workers <= 1:
+            for shard_index in range(shard_count):
+                yield self.generate_shard(shard_index, count, chunk_size, **settings)
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # Keep a bounded number of shards in flight so memory stays flat
+            pending = deque()
+            for shard_index in range(shard_count):
+                pending.append(executor.submit(_generate_shard, shard_index, count, chunk_size, settings))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    
+    def write_chunks(self, file_path, chunks, progress=None):
+        """Write DataFrame chunks to a single CSV or Parquet file as they arrive"""
+        written = 0
+        if file_path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            writer = None
+            try:
+                for chunk in chunks:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(file_path, table.schema)
+                    writer.write_table(table)
+                    written += len(chunk)
+                    if progress:
+                        progress(written)
+            finally:
+                if writer is not None:
+                    writer.close()
+        elif file_path.endswith('.csv'):
+            with open(file_path, "w", encoding="utf-8-sig", newline="") as f:
+                for chunk in chunks:
+                    chunk.to_csv(f, header=(written == 0), index=False)
+                    written += len(chunk)
+                    if progress:
+                        progress(written)
+        else:
+            raise ValueError("Streaming export supports .csv and .parquet files only")
+        return written
+    
+    def stream_to_file(self, file_path, count, chunk_size=100000, workers=1, progress=None, **settings):
+        """Generate records chunk by chunk and write each chunk straight to CSV or Parquet
+        
+        Only a bounded number of chunks is held in memory at a time. progress is
+        called with the number of records written so far.
+        """
+        # Validate before the output file is created
+        self.shard_count(count, chunk_size)
+        return self.write_chunks(file_path, self.generate_chunks(count, chunk_size, workers, **settings), progress)
+    
+    def generate_partitioned(self, output_dir, count, chunk_size=100000, workers=1, file_format="csv",
+                             progress=None, **settings):
+        """Generate a cohort as one file per shard (part-00000.csv, ...) in output_dir
+        
+        Each worker process writes its own shards, so no records pass between
+        processes. Returns the list of written files.
+        """
+        shard_count = self.shard_count(count, chunk_size)
+        workers = self.pool_size(count, shard_count, workers)
+        os.makedirs(output_dir, exist_ok=True)
+        settings["seed"] = np.random.SeedSequence(settings.get("seed")).entropy
+        paths = [os.path.join(output_dir, f"part-{i:05d}.{file_format}") for i in range(shard_count)]
+        
+        written = 0
+        if workers <= 1:
+            for shard_index, path in enumerate(paths):
+                written += _write_shard(path, shard_index, count, chunk_size, settings)
+                if progress:
+                    progress(written)
+            return paths
+        
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_write_shard, path, shard_index, count, chunk_size, settings)
+                       for shard_index, path in enumerate(paths)]
+            for future in as_completed(futures):
+                written += future.result()
+                if progress:
+                    progress(written)
+        return paths
+    
     def generate_data(self):
         """Generate student data"""
         try:
@@ -280,6 +691,15 @@ class StudentDataGenerator:
                 messagebox.showwarning("Warning", "Please select at least one subject")
                 return
             
+            # Fast mode: build the whole table with NumPy
+            if self.vectorized.get():
+                self.generated_data = self.generate_dataframe(
+                    count, self.id_prefix.get(), self.class_range.get(),
+                    self.get_subject_settings(), self.get_rng())
+                self.update_result_table()
+                messagebox.showinfo("Success", f"Successfully generated {count} student records")
+                return
+            
             # Prepare data structure
             data = []
             columns = ["No.", "Student ID", "Name", "Class"] + [subj["name"] for subj in selected_subjects]
@@ -346,6 +766,14 @@ class StudentDataGenerator:
         if len(self.generated_data) > 50:
             self.result_tree.insert("", tk.END, values=["...", "Showing first 50 rows only", "...", "..."] + ["..." for _ in range(len(columns)-4)])
     
+    def use_generated_data(self):
+        """Hand the generated data to the analysis window"""
+        if self.generated_data is None:
+            messagebox.showwarning("Warning", "Please generate data first")
+            return
+        
+        self.on_use(self.generated_data.copy())
+    
     def export_data(self):
         """Export data"""
         if self.generated_data is None:
@@ -386,6 +814,8 @@ class StudentDataGenerator:
         self.student_count.set(50)
         self.id_prefix.set("2023")
         self.class_range.set("Random Assignment")
+        self.vectorized.set(True)
+        self.seed.set("")
         
         # Reset subject settings
         for subject in SUBJECTS:
@@ -402,56 +832,1828 @@ class StudentDataGenerator:
             self.result_tree.delete(item)
 
 
-class StudentGradeAnalysisSystem:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Simple Student Grade Analysis System Based on Python")
-        self.root.geometry("1200x800")
-        self.root.minsize(1000, 700)
+def _generate_shard(shard_index, count, shard_size, settings):
+    """Generate one shard in a worker process"""
+    return StudentDataGenerator().generate_shard(shard_index, count, shard_size, **settings)
+
+
+def _write_shard(path, shard_index, count, shard_size, settings):
+    """Generate one shard in a worker process and write it to its own file"""
+    generator = StudentDataGenerator()
+    return generator.write_chunks(path, [generator.generate_shard(shard_index, count, shard_size, **settings)])
+
+
+def spawned_process_pool(workers, **kwargs):
+    """ProcessPoolExecutor whose workers are spawned instead of forked
+    
+    Used for pools started from the GUI: forking a process that runs Tk and
+    other threads (the module preload, a TaskRunner worker) can deadlock the
+    child on a lock one of those threads held.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"), **kwargs)
+
+
+def _init_render_worker():
+    """Process pool initializer: unpickled figures must attach to the non-interactive Agg backend"""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _write_report_cards(cards, target):
+    """Write a part of the report cards in a worker process: one merged file, or a list of per-student files"""
+    if isinstance(target, str):
+        return cards.write_pages(target)
+    for i, path in enumerate(target):
+        cards.subset(i, i + 1).write_pages(path)
+    return target
+
+
+def _render_pickled_figure(figure_bytes, dpi, path):
+    """Render a figure pickled by pickle_figure (to path, or to PNG bytes)"""
+    import pickle
+    return render_figure(pickle.loads(figure_bytes), dpi, path)
+
+
+def pickle_figure(fig):
+    """Pickle a figure so that it unpickles detached from pyplot
+    
+    Unpickling a pyplot figure normally registers it with pyplot's (GUI)
+    backend; a detached copy can be rendered from any thread or process.
+    """
+    import io
+    import pickle
+    
+    class FigurePickler(pickle.Pickler):
+        def reducer_override(self, obj):
+            if obj is not fig:
+                return NotImplemented
+            reduced = obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+            reduced[2].pop("_restore_to_pylab", None)
+            return reduced
+    
+    buffer = io.BytesIO()
+    FigurePickler(buffer, pickle.HIGHEST_PROTOCOL).dump(fig)
+    return buffer.getvalue()
+
+
+def snapshot_figures(figures, dpi=150):
+    """Detached pickled copies of figures, for background jobs (see pickle_figure)
+    
+    A figure that cannot be pickled is replaced by a picture of itself, rendered here at dpi.
+    """
+    import io
+    from matplotlib.figure import Figure
+    
+    snapshots = []
+    for fig in figures:
+        try:
+            snapshots.append(pickle_figure(fig))
+        except Exception:
+            image = (plt.imread(io.BytesIO(render_figure(fig, dpi))) * 255).astype(np.uint8)
+            picture = Figure(figsize=(image.shape[1] / dpi, image.shape[0] / dpi))
+            ax = picture.add_axes([0, 0, 1, 1])
+            ax.imshow(image)
+            ax.axis("off")
+            snapshots.append(pickle_figure(picture))
+    return snapshots
+
+
+def load_figure(figure):
+    """Figure from a snapshot_figures entry (figures are passed through)"""
+    if isinstance(figure, bytes):
+        import pickle
+        return pickle.loads(figure)
+    return figure
+
+
+def render_figure(fig, dpi=150, path=None):
+    """Save a figure to path, or return its PNG bytes rendered into an in-memory buffer"""
+    if path is not None:
+        fig.savefig(path, dpi=dpi, bbox_inches='tight')
+        return path
+    
+    import io
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def rasterize_figures(figures, dpi=150, paths=None, workers=None, progress=None):
+    """Render figures: PNG bytes of each figure, or each written to its entry of paths
+    
+    figures are Figures or snapshot_figures entries (which background
+    threads may render). When there are enough cores and figures (at most
+    one worker per core, each with RENDER_FIGURES_PER_WORKER figures or
+    more), they are pickled to a process pool whose workers render (and
+    encode and write) with Agg. Otherwise, and for figures that cannot be
+    pickled or if the pool cannot start, they are rendered in this process.
+    progress(done, total, index) is called as each figure finishes.
+    """
+    from concurrent.futures import as_completed
+    from concurrent.futures.process import BrokenProcessPool
+    
+    paths = paths or [None] * len(figures)
+    results = [None] * len(figures)
+    cores = os.cpu_count() or 1
+    workers = min(workers or cores, cores, len(figures) // RENDER_FIGURES_PER_WORKER)
+    done = 0
+    
+    if workers > 1:
+        payloads = {}
+        for i, fig in enumerate(figures):
+            try:
+                payloads[i] = fig if isinstance(fig, bytes) else pickle_figure(fig)
+            except Exception:
+                pass
         
-        # Data storage
-        self.data = None
-        self.analysis_results = None
-        self.current_file = None
+        try:
+            with spawned_process_pool(workers, initializer=_init_render_worker) as executor:
+                futures = {executor.submit(_render_pickled_figure, payload, dpi, paths[i]): i
+                           for i, payload in payloads.items()}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+                    done += 1
+                    if progress:
+                        progress(done, len(figures), futures[future])
+        except (BrokenProcessPool, OSError):
+            pass
+    
+    for i, fig in enumerate(figures):
+        if results[i] is None:
+            results[i] = render_figure(load_figure(fig), dpi, paths[i])
+            done += 1
+            if progress:
+                progress(done, len(figures), i)
+    return results
+
+
+def chart_filenames(prefix, analysis_type, titles, extension=".png"):
+    """Deterministic file names for exported charts: prefix, analysis type and chart title (duplicates numbered)"""
+    names = []
+    seen = Counter()
+    for title in titles:
+        name = f"{prefix}_{analysis_type}_{re.sub(r'[^0-9A-Za-z]+', '_', title).strip('_')}"
+        seen[name] += 1
+        names.append(f"{name}_{seen[name]}{extension}" if seen[name] > 1 else f"{name}{extension}")
+    return names
+
+
+def iter_data_chunks(file_path, chunksize=100000):
+    """Read a CSV or Excel grade file as a sequence of DataFrames of at most chunksize rows"""
+    if file_path.endswith('.csv'):
+        yield from pd.read_csv(file_path, chunksize=chunksize)
+    elif file_path.endswith('.xlsx'):
+        # openpyxl read-only mode streams rows instead of loading the whole sheet
+        from openpyxl import load_workbook
+        
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [str(col) for col in header]
+            buffer = []
+            for row in rows:
+                buffer.append(row)
+                if len(buffer) >= chunksize:
+                    yield pd.DataFrame(buffer, columns=columns)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=columns)
+        finally:
+            workbook.close()
+    else:  # .xls files have no streaming reader
+        data = pd.read_excel(file_path)
+        for start in range(0, len(data), chunksize):
+            yield data.iloc[start:start + chunksize]
+
+
+class ScoreAggregate:
+    """Running aggregates of one score column, updated incrementally
+    
+    Mean and variance use Welford/Chan updates, so chunks can be added,
+    removed (corrected records) or whole aggregates merged without revisiting
+    old values. Quantiles come from a histogram with one bin per `resolution`
+    score points, starting at the lowest score seen; histograms of separate
+    aggregates simply add up, and quantiles are exact for scores on the grid
+    (off by at most half a bin otherwise). When the scores span more than
+    MAX_BINS bins, `factor` grid steps are merged into one bin (10x coarser
+    each time) so memory stays bounded.
+    """
+    # Largest histogram kept per column (2 MB)
+    MAX_BINS = 1 << 18
+    
+    def __init__(self, pass_score=60, excellent_score=90, resolution=1.0):
+        self.pass_score = pass_score
+        self.excellent_score = excellent_score
+        self.resolution = resolution
+        self.factor = 1  # Grid steps per histogram bin
+        self.origin = 0  # Bin index of histogram[0]
+        self.count = 0
+        self.mean_value = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+        self.min = np.inf
+        self.max = -np.inf
+        self.pass_count = 0
+        self.excellent_count = 0
+        self.histogram = np.zeros(0, dtype=np.int64)
+    
+    @classmethod
+    def of(cls, values, **kwargs):
+        """Aggregate of a whole score column"""
+        aggregate = cls(resolution=cls.resolution_for(values), **kwargs)
+        aggregate.update(values)
+        return aggregate
+    
+    @staticmethod
+    def resolution_for(values):
+        """Histogram bin width for a column: whole points for integer scores, 0.01 otherwise"""
+        return 1.0 if pd.api.types.is_integer_dtype(values) else 0.01
+    
+    @staticmethod
+    def clean(values):
+        """Scores as a float array without missing values"""
+        values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float)
+        return values[~np.isnan(values)]
+    
+    def combine(self, count, mean, m2):
+        """Chan et al. update of count/mean/M2 with a group's moments (negative count removes the group)"""
+        total = self.count + count
+        if total <= 0:
+            self.count, self.mean_value, self.m2 = 0, 0.0, 0.0
+            return
+        delta = mean - self.mean_value
+        self.mean_value += delta * count / total
+        self.m2 = max(self.m2 + m2 + delta * delta * self.count * count / total, 0.0)
+        self.count = total
+    
+    def bin_values(self, index):
+        """Scores at the centre of the given bin indices"""
+        return (np.asarray(index) * self.factor + (self.factor - 1) / 2) * self.resolution
+    
+    def bin_index(self, values):
+        return np.rint(np.asarray(values) / self.resolution).astype(np.int64) // self.factor
+    
+    def coarsen(self, factor=10):
+        """Merge every factor bins into one"""
+        self.factor *= factor
+        if len(self.histogram):
+            index = (self.origin + np.arange(len(self.histogram))) // factor
+            self.histogram = np.bincount(index - index[0], weights=self.histogram).astype(np.int64)
+            self.origin = int(index[0])
+    
+    def fit(self, low, high):
+        """Coarsen the bins until scores from low to high fit into MAX_BINS bins next to the current histogram"""
+        while True:
+            first, last = self.bin_index([low, high])
+            if len(self.histogram):
+                first, last = min(first, self.origin), max(last, self.origin + len(self.histogram) - 1)
+            if last - first < self.MAX_BINS:
+                return
+            self.coarsen()
+    
+    def add_histogram(self, bins, first, sign=1):
+        """Add counts of consecutive bins starting at bin index first, growing the histogram as needed"""
+        if not len(self.histogram):
+            self.histogram, self.origin = np.zeros(len(bins), dtype=np.int64), first
+        low = min(self.origin, first)
+        high = max(self.origin + len(self.histogram), first + len(bins))
+        if low < self.origin or high > self.origin + len(self.histogram):
+            grown = np.zeros(high - low, dtype=np.int64)
+            grown[self.origin - low:self.origin - low + len(self.histogram)] = self.histogram
+            self.histogram, self.origin = grown, low
+        start = first - self.origin
+        self.histogram[start:start + len(bins)] += sign * bins
+    
+    def bin_counts(self, values, weights=None):
+        """Counts of values per bin, and the bin index of the first count"""
+        index = self.bin_index(values)
+        first = int(index.min())
+        return np.bincount(index - first, weights=weights).astype(np.int64), first
+    
+    def update(self, values):
+        """Fold a chunk of scores into the aggregates (missing values are skipped)"""
+        values = self.clean(values)
+        if len(values) == 0:
+            return
         
-        # Create data generator instance
-        self.data_generator = StudentDataGenerator(self.root)
+        mean = values.mean()
+        self.combine(len(values), mean, np.square(values - mean).sum())
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.pass_count += int((values >= self.pass_score).sum())
+        self.excellent_count += int((values >= self.excellent_score).sum())
+        self.fit(values.min(), values.max())
+        self.add_histogram(*self.bin_counts(values))
+    
+    def remove(self, values):
+        """Take previously added scores out of the aggregates (e.g. before correcting them)"""
+        values = self.clean(values)
+        if len(values) == 0:
+            return
         
-        # Create main interface
-        self.create_widgets()
+        mean = values.mean()
+        self.combine(-len(values), mean, -np.square(values - mean).sum())
+        self.pass_count -= int((values >= self.pass_score).sum())
+        self.excellent_count -= int((values >= self.excellent_score).sum())
+        self.add_histogram(*self.bin_counts(values), sign=-1)
+        
+        # Extremes that were removed are recovered from the histogram
+        if values.min() <= self.min or values.max() >= self.max:
+            occupied = np.flatnonzero(self.histogram)
+            if len(occupied):
+                self.min = max(self.min, self.bin_values(self.origin + occupied[0]))
+                self.max = min(self.max, self.bin_values(self.origin + occupied[-1]))
+            else:
+                self.min, self.max = np.inf, -np.inf
+    
+    def merge(self, other):
+        """Fold another aggregate of the same column (e.g. from another chunk or worker) into this one"""
+        self.combine(other.count, other.mean_value, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.pass_count += other.pass_count
+        self.excellent_count += other.excellent_count
+        
+        # Re-bin the other histogram's scores onto this one's (never finer than either)
+        values, counts = other.occupied()
+        if len(values):
+            while self.factor * self.resolution < other.factor * other.resolution:
+                self.coarsen()
+            self.fit(values[0], values[-1])
+            self.add_histogram(*self.bin_counts(values, weights=counts))
+    
+    def mean(self):
+        return self.mean_value if self.count else np.nan
+    
+    def std(self):
+        """Sample standard deviation (same as pandas .std())"""
+        if self.count < 2:
+            return np.nan
+        return np.sqrt(self.m2 / (self.count - 1))
+    
+    def occupied(self):
+        """Scores of the non-empty histogram bins and their counts (a weighted sample of the column)"""
+        bins = np.flatnonzero(self.histogram)
+        return self.bin_values(self.origin + bins), self.histogram[bins]
+    
+    def box_stats(self, label, whis=1.5):
+        """Box plot statistics for Axes.bxp() (whiskers and fliers from the histogram's occupied bins)"""
+        q1, median, q3 = self.quantile(0.25), self.quantile(0.5), self.quantile(0.75)
+        low, high = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+        values, _ = self.occupied()
+        inside = values[(values >= low) & (values <= high)]
+        return {
+            "label": label, "med": median, "q1": q1, "q3": q3, "mean": self.mean(),
+            "whislo": inside.min() if len(inside) else q1,
+            "whishi": inside.max() if len(inside) else q3,
+            "fliers": values[(values < low) | (values > high)]
+        }
+    
+    def kde(self, cut=0.0, bw_adjust=1.0):
+        """Gaussian kernel density estimate on the histogram grid, computed by FFT convolution
         
-    def create_widgets(self):
-        # Create menu bar
-        self.create_menu()
+        The bandwidth follows Scott's rule like scipy's gaussian_kde (which
+        seaborn uses), but the cost depends on the number of bins instead of
+        the number of scores. The curve extends cut bandwidths past the data.
+        Returns grid positions and densities.
+        """
+        values, _ = self.occupied()
+        if self.count < 2 or not self.std() > 0:
+            return np.array([]), np.array([])
+        bandwidth = bw_adjust * self.std() * self.count ** (-1 / 5)
+        
+        # Zero padding keeps the circular convolution from wrapping the kernel tails around
+        occupied = np.flatnonzero(self.histogram)
+        first, last = occupied[0], occupied[-1]
+        width = self.factor * self.resolution
+        pad = int(np.ceil((cut + 4) * bandwidth / width))
+        counts = np.zeros(last - first + 1 + 2 * pad)
+        counts[pad:pad + last - first + 1] = self.histogram[first:last + 1]
+        
+        offsets = (np.arange(len(counts)) - len(counts) // 2) * width
+        kernel = np.exp(-0.5 * np.square(offsets / bandwidth))
+        kernel /= kernel.sum() * width
+        density = np.fft.irfft(np.fft.rfft(counts) * np.fft.rfft(np.fft.ifftshift(kernel)), n=len(counts)) / self.count
+        
+        grid = self.bin_values(np.arange(len(counts)) + self.origin + first - pad)
+        keep = (grid >= values[0] - cut * bandwidth) & (grid <= values[-1] + cut * bandwidth)
+        return grid[keep], np.clip(density[keep], 0, None)
+    
+    def histogram_with_kde(self, bins):
+        """Occupied bins plus the KDE scaled to a bins-bin count histogram (as histplot(kde=True) draws it)"""
+        values, counts = self.occupied()
+        grid, density = self.kde()
+        width = np.diff(np.histogram_bin_edges(values, bins))[0] if len(values) else 1.0
+        return {"histogram": (values, counts), "kde": (grid, density * self.count * width)}
+    
+    def quantile(self, q):
+        """Linearly interpolated quantile from the histogram"""
+        if self.count == 0:
+            return np.nan
+        cumulative = np.cumsum(self.histogram)
+        position = q * (self.count - 1)
+        lower = np.searchsorted(cumulative, np.floor(position), side='right')
+        upper = np.searchsorted(cumulative, np.ceil(position), side='right')
+        value = self.bin_values(self.origin + lower + (upper - lower) * (position - np.floor(position)))
+        return float(np.clip(value, self.min, self.max))
+
+
+class CorrelationEngine:
+    """Pearson and Spearman correlation matrices of the subject columns
+    
+    Pearson correlation comes from accumulated sums and cross-products of the
+    complete rows (shifted by the first chunk's means for accuracy), so records
+    can be appended or removed with one small matrix product and the matrix is
+    recomputed from k x k sums. Spearman correlation ranks each column once and
+    correlates the standardized ranks with a single matrix product.
+    """
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.count = 0
+        self.shift = None
+        self.sums = np.zeros(len(self.columns))
+        self.products = np.zeros((len(self.columns), len(self.columns)))
+    
+    def matrix(self, chunk):
+        """Contiguous float matrix of the complete rows of a chunk"""
+        matrix = np.ascontiguousarray(chunk[self.columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float))
+        return matrix[~np.isnan(matrix).any(axis=1)]
+    
+    def add(self, chunk, sign):
+        matrix = self.matrix(chunk)
+        if len(matrix) == 0:
+            return
+        if self.shift is None:
+            self.shift = matrix.mean(axis=0)
+        matrix -= self.shift
+        self.count += sign * len(matrix)
+        self.sums += sign * matrix.sum(axis=0)
+        self.products += sign * (matrix.T @ matrix)
+    
+    def update(self, chunk):
+        """Fold the complete rows of a chunk into the sums"""
+        self.add(chunk, 1)
+    
+    def remove(self, chunk):
+        """Take previously added rows back out of the sums"""
+        self.add(chunk, -1)
+    
+    @staticmethod
+    def standardized_correlation(matrix, columns):
+        """Correlation of the columns of a matrix: standardize once, then one matrix product"""
+        if len(matrix) < 2:
+            return pd.DataFrame(np.nan, index=columns, columns=columns)
+        std = matrix.std(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            standardized = (matrix - matrix.mean(axis=0)) / std
+            correlation = np.clip(standardized.T @ standardized / len(matrix), -1, 1)
+        np.fill_diagonal(correlation, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(correlation, index=columns, columns=columns)
+    
+    def pearson(self):
+        """Pearson correlation matrix from the accumulated sums"""
+        if self.count < 2:
+            return pd.DataFrame(np.nan, index=self.columns, columns=self.columns)
+        covariance = self.products - np.outer(self.sums, self.sums) / self.count
+        std = np.sqrt(np.clip(np.diag(covariance), 0, None))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            correlation = np.clip(covariance / np.outer(std, std), -1, 1)
+        np.fill_diagonal(correlation, np.where(std > 0, 1.0, np.nan))
+        return pd.DataFrame(correlation, index=self.columns, columns=self.columns)
+    
+    def spearman(self, data):
+        """Spearman rank correlation of the complete rows of data (average ranks for ties)"""
+        complete = data[self.columns].apply(pd.to_numeric, errors='coerce').dropna()
+        ranks = complete.rank().to_numpy(dtype=float)
+        return self.standardized_correlation(ranks, self.columns)
+
+
+class GroupAggregator:
+    """Per-group score statistics computed with np.bincount over integer group codes
+    
+    Groups are integer codes (e.g. the codes of the categorical Class column,
+    -1 for missing) with an index describing each code, so no string keys are
+    hashed or compared per analysis. Count, mean, std, pass rate and excellent
+    rate of every subject come from bincount sums of values, squares and
+    threshold hits. The index may have several levels (grade -> class);
+    level() regroups by a coarser level through the codes alone.
+    """
+    METRICS = ["count", "mean", "std", "pass_rate", "excellent_rate"]
+    
+    def __init__(self, codes, index):
+        self.codes = np.asarray(codes, dtype=np.int64)
+        self.index = index
+    
+    @classmethod
+    def for_classes(cls, data, column="Class", by_grade=True):
+        """Groups of the class column (factorized unless it is already categorical), under their grade level"""
+        values = data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, classes = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, classes = pd.factorize(values)
+        classes = pd.Index(classes).astype(str)
+        
+        if not by_grade:
+            return cls(codes, pd.Index(classes, name=column))
+        
+        # "Grade 10(3)" belongs to "Grade 10"; names without a section are their own grade
+        grades = classes.str.replace(r"\s*\(.*$", "", regex=True)
+        index, order = pd.MultiIndex.from_arrays([grades, classes], names=["Grade", column]).sort_values(return_indexer=True)
+        position = np.empty(len(order), dtype=np.int64)
+        position[order] = np.arange(len(order))
+        codes = np.where(codes >= 0, position[np.maximum(codes, 0)], -1)
+        return cls(codes, index)
+    
+    def level(self, name):
+        """Coarser groups made of one index level (e.g. "Grade")"""
+        level_codes, level_values = pd.factorize(self.index.get_level_values(name), sort=True)
+        codes = np.where(self.codes >= 0, level_codes[np.maximum(self.codes, 0)], -1)
+        return GroupAggregator(codes, pd.Index(level_values, name=name))
+    
+    def aggregate(self, data, columns, pass_score=60, excellent_score=90):
+        """Metrics of each group (rows) as columns (metric, subject); groups without records are left out"""
+        groups = len(self.index)
+        valid_rows = self.codes >= 0
+        codes = self.codes[valid_rows]
+        results = {metric: {} for metric in self.METRICS}
         
-        # Create analysis button area (at the top)
-        analysis_frame = ttk.Frame(self.root, padding="10")
-        analysis_frame.pack(fill=tk.X, side=tk.BOTTOM)
+        for col in columns:
+            values = pd.to_numeric(data[col], errors='coerce').to_numpy(dtype=float)[valid_rows]
+            valid = ~np.isnan(values)
+            group, values = codes[valid], values[valid]
+            # Deviations from the overall mean keep the sums of squares accurate
+            shifted = values - (values.mean() if len(values) else 0.0)
+            
+            count = np.bincount(group, minlength=groups)
+            sums = np.bincount(group, weights=shifted, minlength=groups)
+            squares = np.bincount(group, weights=shifted * shifted, minlength=groups)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                mean = sums / count
+                variance = (squares - sums * mean) / (count - 1)
+                results["count"][col] = count
+                results["mean"][col] = mean + (values.mean() if len(values) else 0.0)
+                results["std"][col] = np.sqrt(np.clip(variance, 0, None))
+                results["pass_rate"][col] = np.bincount(group, weights=values >= pass_score, minlength=groups) / count * 100
+                results["excellent_rate"][col] = np.bincount(group, weights=values >= excellent_score, minlength=groups) / count * 100
+        
+        table = pd.concat({metric: pd.DataFrame(results[metric], index=self.index) for metric in self.METRICS}, axis=1)
+        occupied = np.bincount(codes, minlength=groups) > 0
+        return table[occupied]
+
+
+class StreamingAggregates:
+    """Per-subject running aggregates of a grade table, updated chunk by chunk
+    
+    Used for files imported in streaming mode and as the running statistics of
+    a loaded table that records are appended to or corrected in.
+    """
+    def __init__(self):
+        self.records = 0
+        self.columns = None
+        self.subject_columns = []
+        self.subjects = {}
+        self.total = ScoreAggregate()
+        self.names = Counter()
+        self.preview = None
+        self.correlation = CorrelationEngine([])
+    
+    def update(self, chunk):
+        """Fold one chunk of records into the aggregates"""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            # Same subject rule as the analyses, limited to numeric columns
+            self.subject_columns = [col for col in chunk.columns
+                                    if col not in ["No.", "Student ID", "Name", "Class", "Total Score", "Rank"]
+                                    and pd.api.types.is_numeric_dtype(chunk[col])]
+            self.subjects = {col: ScoreAggregate(resolution=ScoreAggregate.resolution_for(chunk[col]))
+                             for col in self.subject_columns}
+            self.total = ScoreAggregate(resolution=ScoreAggregate.resolution_for(self.total_scores(chunk)))
+            self.correlation = CorrelationEngine(self.subject_columns)
+            self.preview = chunk.head(1000)
+        
+        self.records += len(chunk)
+        for subject in self.subject_columns:
+            self.subjects[subject].update(chunk[subject])
+        self.total.update(self.total_scores(chunk))
+        self.correlation.update(chunk)
+        
+        if "Name" in chunk.columns:
+            self.names.update(self.name_counts(chunk))
+    
+    def remove(self, chunk):
+        """Take records that were folded in earlier back out of the aggregates"""
+        self.records -= len(chunk)
+        for subject in self.subject_columns:
+            self.subjects[subject].remove(chunk[subject])
+        self.total.remove(self.total_scores(chunk))
+        self.correlation.remove(chunk)
+        
+        if "Name" in chunk.columns:
+            self.names.subtract(self.name_counts(chunk))
+            self.names = +self.names  # Drop names whose count reached zero
+    
+    @staticmethod
+    def name_counts(chunk):
+        counts = chunk["Name"].value_counts()
+        return counts[counts > 0].to_dict()
+    
+    def total_scores(self, chunk):
+        """The Total Score column, or the sum of the subject columns if there is none"""
+        if "Total Score" in chunk.columns:
+            return chunk["Total Score"]
+        return chunk[self.subject_columns].apply(pd.to_numeric, errors='coerce').sum(axis=1)
+
+
+class SubjectStatistics:
+    """Per-subject statistics of a grade table as one structured result
+    
+    table has one row per subject with count, mean, std, min, 25%, 50%, 75%,
+    max, pass_rate and excellent_rate; total holds the same metrics for the
+    total score (or None). The statistics text panel, the PDF report and the
+    Excel export all render from this object.
+    """
+    METRICS = ["count", "mean", "std", "min", "25%", "50%", "75%", "max", "pass_rate", "excellent_rate"]
+    
+    def __init__(self, table, total, records, student_count=None):
+        self.table = table
+        self.total = total
+        self.records = records
+        self.student_count = student_count
+        self.subjects = list(table.index)
+        
+    @classmethod
+    def from_data(cls, data, subject_columns, pass_score=60, excellent_score=90):
+        """Compute every metric for all subjects (and the total score) in one vectorized pass"""
+        columns = list(subject_columns)
+        if "Total Score" in data.columns:
+            columns.append("Total Score")
+        matrix = data[columns].to_numpy(dtype=float)
+        
+        # One sort per column gives min, max and all quantiles; missing values sort last
+        ordered = np.sort(matrix, axis=0)
+        count = (~np.isnan(matrix)).sum(axis=0)
+        mean = np.nansum(matrix, axis=0) / np.maximum(count, 1)
+        variance = np.nansum(np.square(matrix - mean), axis=0) / np.maximum(count - 1, 1)
+        
+        def quantile(q):
+            # Linear interpolation between order statistics, like pandas .quantile()
+            position = q * np.maximum(count - 1, 0)
+            lower = np.floor(position).astype(int)
+            upper = np.ceil(position).astype(int)
+            cols = np.arange(len(columns))
+            return ordered[lower, cols] + (ordered[upper, cols] - ordered[lower, cols]) * (position - lower)
+        
+        records = max(len(data), 1)
+        table = pd.DataFrame({
+            "count": count,
+            "mean": mean,
+            "std": np.sqrt(variance),
+            "min": ordered[0],
+            "25%": quantile(0.25),
+            "50%": quantile(0.5),
+            "75%": quantile(0.75),
+            "max": ordered[np.maximum(count - 1, 0), np.arange(len(columns))],
+            "pass_rate": (matrix >= pass_score).sum(axis=0) / records * 100,
+            "excellent_rate": (matrix >= excellent_score).sum(axis=0) / records * 100
+        }, index=columns)
+        # Metrics of empty columns (and std of single values) are undefined
+        table.loc[count == 0, ["mean", "min", "25%", "50%", "75%", "max"]] = np.nan
+        table.loc[count < 2, "std"] = np.nan
+        
+        total = table.loc["Total Score"] if "Total Score" in data.columns else None
+        student_count = data["Name"].nunique() if "Name" in data.columns else None
+        return cls(table.loc[list(subject_columns)], total, len(data), student_count)
+    
+    @classmethod
+    def from_aggregates(cls, summary):
+        """Build the result from the running aggregates of a streaming import"""
+        def row(agg):
+            return [agg.count, agg.mean(), agg.std(), agg.min, agg.quantile(0.25), agg.quantile(0.5),
+                    agg.quantile(0.75), agg.max, agg.pass_count / max(summary.records, 1) * 100,
+                    agg.excellent_count / max(summary.records, 1) * 100]
+        
+        table = pd.DataFrame([row(agg) for agg in summary.subjects.values()],
+                             index=list(summary.subjects), columns=cls.METRICS)
+        total = pd.Series(row(summary.total), index=cls.METRICS) if summary.total.count else None
+        student_count = len(summary.names) if "Name" in summary.columns else None
+        return cls(table, total, summary.records, student_count)
+    
+    def to_frame(self):
+        """describe()-style table (metrics as rows, subjects and total score as columns) for export"""
+        frame = self.table.T
+        if self.total is not None:
+            frame["Total Score"] = self.total
+        return frame
+
+
+class ReportCards:
+    """Per-student report cards: scores, class/grade averages and percentiles, and a radar chart
+    
+    Cohort statistics are computed once for the whole table (one grouped rank
+    per cohort for all percentiles, class and grade means from
+    GroupAggregator). Every page reuses the same ReportLab form (frame,
+    headings, table grid and radar background) plus one cached form per class
+    with its average polygon, so a card only adds the student's own values.
+    Cards are written by parallel workers, either one file per student or
+    parts merged into one PDF (with pypdf if it is installed).
+    """
+    COLORS = {"student": (0.12, 0.47, 0.71), "class": (1.0, 0.5, 0.05)}
+    TABLE_TOP = 667  # Baseline of the score table header on a letter page
+    
+    def __init__(self, data, subject_columns, subjects=SUBJECTS):
+        self.subjects = [col for col in subject_columns if col != "Average Score"]
+        ranges = {subj["name"]: subj["max"] for subj in subjects}
+        scores = data[self.subjects].apply(pd.to_numeric, errors='coerce')
+        self.scores = scores.to_numpy(dtype=float)
+        self.scale = np.array([ranges.get(col, np.nanmax(self.scores[:, i]) if len(scores) else 100)
+                               for i, col in enumerate(self.subjects)], dtype=float)
+        
+        total = data["Total Score"] if "Total Score" in data.columns else scores.sum(axis=1)
+        self.students = pd.DataFrame({
+            "Student ID": data["Student ID"].astype(str).to_numpy() if "Student ID" in data.columns else np.arange(1, len(data) + 1).astype(str),
+            "Name": data["Name"].astype(str).to_numpy() if "Name" in data.columns else "",
+            "Total Score": np.asarray(total, dtype=float),
+            "Rank": pd.Series(np.asarray(total, dtype=float)).rank(ascending=False, method="min").to_numpy()
+        })
+        
+        # Class and grade cohorts as integer codes (one code per class, classes nested in grades)
+        if "Class" in data.columns:
+            classes = GroupAggregator.for_classes(data)
+        else:
+            classes = GroupAggregator(np.zeros(len(data)), pd.MultiIndex.from_tuples(
+                [("All Students", "All Students")], names=["Grade", "Class"]))
+        grades = classes.level("Grade")
+        self.class_codes, self.grade_codes = classes.codes, grades.codes
+        self.class_names = np.asarray(classes.index.get_level_values(-1), dtype=object)
+        self.grade_names = np.asarray(grades.index, dtype=object)
+        self.class_means = classes.aggregate(data, self.subjects)["mean"].reindex(classes.index).to_numpy(dtype=float)
+        self.grade_means = grades.aggregate(data, self.subjects)["mean"].reindex(grades.index).to_numpy(dtype=float)
+        self.class_percentiles = self.percentiles(scores, self.class_codes)
+        self.grade_percentiles = self.percentiles(scores, self.grade_codes)
+    
+    @staticmethod
+    def percentiles(scores, codes):
+        """Share of each student's cohort (in %) with the same or a lower score, for every subject at once"""
+        keys = np.where(codes >= 0, codes, np.nan)
+        return (scores.groupby(keys).rank(method="max", pct=True) * 100).to_numpy(dtype=float)
+    
+    def __len__(self):
+        return len(self.students)
+    
+    def subset(self, start, stop):
+        """Cards of students start..stop-1 (sharing the cohort statistics), e.g. to send to a worker"""
+        part = object.__new__(ReportCards)
+        part.__dict__.update(self.__dict__)
+        part.students = self.students.iloc[start:stop]
+        for name in ("scores", "class_codes", "grade_codes", "class_percentiles", "grade_percentiles"):
+            setattr(part, name, getattr(self, name)[start:stop])
+        return part
+    
+    def file_names(self):
+        """One file name per student from student ID and name (duplicates numbered)"""
+        names = []
+        seen = Counter()
+        for student_id, name in zip(self.students["Student ID"], self.students["Name"]):
+            stem = re.sub(r'[^0-9A-Za-z]+', '_', f"{student_id}_{name}").strip('_') or "student"
+            seen[stem] += 1
+            names.append(f"{stem}_{seen[stem]}.pdf" if seen[stem] > 1 else f"{stem}.pdf")
+        return names
+    
+    def radar_points(self, values, center=(306, 220), radius=130):
+        """Page coordinates of a radar polygon (angles and order as in the advanced analysis radar chart)"""
+        angles = np.linspace(0, 2 * np.pi, len(self.subjects), endpoint=False)
+        fractions = np.clip(np.nan_to_num(values / self.scale), 0, 1) * radius
+        return list(zip(center[0] + fractions * np.cos(angles), center[1] + fractions * np.sin(angles)))
+    
+    def draw_polygon(self, pdf, points, color, alpha, dash=None):
+        pdf.saveState()
+        path = pdf.beginPath()
+        path.moveTo(*points[0])
+        for point in points[1:]:
+            path.lineTo(*point)
+        path.close()
+        pdf.setStrokeColorRGB(*color)
+        pdf.setFillColorRGB(*color, alpha=alpha)
+        pdf.setDash(*(dash or []))
+        pdf.drawPath(path, stroke=1, fill=1 if alpha else 0)
+        pdf.restoreState()
+    
+    def draw_column(self, pdf, x, values, fmt=None):
+        """One table column as a single text object (one line per subject)"""
+        text = pdf.beginText(x, self.TABLE_TOP - 17)
+        text.setLeading(16)
+        for value in values:
+            text.textLine(value if fmt is None else "-" if np.isnan(value) else format(value, fmt))
+        pdf.drawText(text)
+    
+    def draw_class(self, pdf, class_code, grade_code):
+        """Parts shared by the cards of one class: class/grade names, averages and the class average polygon"""
+        from reportlab.lib.pagesizes import letter
+        missing = np.full(len(self.subjects), np.nan)
+        class_means = self.class_means[class_code] if class_code >= 0 else missing
+        grade_means = self.grade_means[grade_code] if grade_code >= 0 else missing
+        
+        self.draw_polygon(pdf, self.radar_points(class_means), self.COLORS["class"], 0.1, dash=[3, 2])
+        pdf.setFont("Helvetica", 11)
+        pdf.drawString(40, letter[1] - 94, f"Class: {self.class_names[class_code] if class_code >= 0 else '-'}    "
+                                           f"Grade: {self.grade_names[grade_code] if grade_code >= 0 else '-'}")
+        pdf.setFont("Helvetica", 10)
+        self.draw_column(pdf, 290, class_means, ".1f")
+        self.draw_column(pdf, 370, grade_means, ".1f")
+    
+    def draw_template(self, pdf):
+        """Parts shared by every card, as the Form XObject "card" """
+        from reportlab.lib.pagesizes import letter
+        width, height = letter
+        
+        pdf.beginForm("card")
+        pdf.setFont("Helvetica-Bold", 18)
+        pdf.drawString(40, height - 45, "Student Report Card")
+        pdf.setLineWidth(1)
+        pdf.line(40, height - 55, width - 40, height - 55)
+        
+        # Score table header, subject names and row lines
+        pdf.setFont("Helvetica-Bold", 10)
+        for x, label in [(40, "Subject"), (220, "Score"), (290, "Class Avg"), (370, "Grade Avg"),
+                         (450, "Class Pct"), (520, "Grade Pct")]:
+            pdf.drawString(x, self.TABLE_TOP, label)
+        pdf.setFont("Helvetica", 10)
+        self.draw_column(pdf, 40, self.subjects)
+        pdf.setLineWidth(0.3)
+        for row in range(len(self.subjects) + 1):
+            pdf.line(40, self.TABLE_TOP - 5 - row * 16, width - 40, self.TABLE_TOP - 5 - row * 16)
+        
+        # Radar grid, spokes and subject labels
+        pdf.setStrokeColorRGB(0.75, 0.75, 0.75)
+        for level in (0.2, 0.4, 0.6, 0.8, 1.0):
+            self.draw_polygon(pdf, self.radar_points(self.scale * level), (0.75, 0.75, 0.75), 0)
+        pdf.setFont("Helvetica", 8)
+        center = self.radar_points(np.zeros(len(self.subjects)))[0]
+        for (x, y), (lx, ly), subject in zip(self.radar_points(self.scale), self.radar_points(self.scale * 1.12),
+                                              self.subjects):
+            pdf.line(*center, x, y)
+            pdf.drawCentredString(lx, ly - 3, subject)
+        
+        # Legend and footnote
+        for i, (key, label) in enumerate([("student", "Student"), ("class", "Class average")]):
+            pdf.setFillColorRGB(*self.COLORS[key])
+            pdf.rect(40, 300 - i * 14, 10, 8, stroke=0, fill=1)
+            pdf.setFillColorRGB(0, 0, 0)
+            pdf.drawString(55, 300 - i * 14, label)
+        pdf.setFont("Helvetica", 8)
+        pdf.drawString(40, 30, "Pct: share of students in the class / grade with the same or a lower score")
+        pdf.endForm()
+    
+    def write_pages(self, file_path):
+        """Write the cards of all students in this object to one PDF, one page per student"""
+        from reportlab.lib.pagesizes import letter
+        from reportlab.pdfgen import canvas
+        width, height = letter
         
-        # Analysis buttons
-        ttk.Button(
-            analysis_frame, 
-            text="Basic Statistical Analysis", 
-            command=self.perform_basic_analysis
-        ).pack(side=tk.LEFT, padx=5)
+        pdf = canvas.Canvas(file_path, pagesize=letter)
+        self.draw_template(pdf)
+        class_forms = set()
         
-        ttk.Button(
-            analysis_frame, 
-            text="Subject Comparison Analysis", 
-            command=self.perform_subject_analysis
-        ).pack(side=tk.LEFT, padx=5)
+        for row, (student_id, name, total, rank) in enumerate(self.students.itertuples(index=False, name=None)):
+            class_code, grade_code = self.class_codes[row], self.grade_codes[row]
+            
+            # Class part (names, class and grade averages, average polygon): drawn once per class and file
+            if class_code not in class_forms:
+                pdf.beginForm(f"class{class_code}")
+                self.draw_class(pdf, class_code, grade_code)
+                pdf.endForm()
+                class_forms.add(class_code)
+            
+            pdf.doForm("card")
+            pdf.doForm(f"class{class_code}")
+            
+            pdf.setFont("Helvetica", 11)
+            pdf.drawString(40, height - 78, f"Name: {name}    Student ID: {student_id}")
+            pdf.setFont("Helvetica", 10)
+            self.draw_column(pdf, 220, self.scores[row], "g")
+            self.draw_column(pdf, 450, self.class_percentiles[row], ".0f")
+            self.draw_column(pdf, 520, self.grade_percentiles[row], ".0f")
+            
+            pdf.setFont("Helvetica-Bold", 11)
+            pdf.drawString(40, self.TABLE_TOP - 22 - len(self.subjects) * 16, f"Total Score: {total:g}    Rank: {rank:.0f}")
+            
+            self.draw_polygon(pdf, self.radar_points(self.scores[row]), self.COLORS["student"], 0.2)
+            pdf.showPage()
         
-        ttk.Button(
-            analysis_frame, 
-            text="Grade Distribution Analysis", 
-            command=self.perform_distribution_analysis
-        ).pack(side=tk.LEFT, padx=5)
+        pdf.save()
+        return file_path
+    
+    def write(self, output, per_student=False, workers=None, progress=None):
+        """Write all cards: one PDF per student into directory output, or one merged PDF file output
         
-        ttk.Button(
-            analysis_frame, 
-            text="Advanced Analysis", 
-            command=self.perform_advanced_analysis
-        ).pack(side=tk.LEFT, padx=5)
+        Students are split into parts written by a process pool (default one
+        worker per core); merged parts are joined with pypdf, or the whole file
+        is written by this process if pypdf is not installed.
+        progress(done, total) is called as parts finish. Returns the written paths.
+        """
+        from concurrent.futures import as_completed
+        
+        count = len(self)
+        workers = min(workers or os.cpu_count() or 1, max(count, 1))
+        if not per_student and workers > 1:
+            try:
+                import pypdf  # Merges the parts written by the workers
+            except ImportError:
+                workers = 1
+        
+        if per_student:
+            os.makedirs(output, exist_ok=True)
+            paths = [os.path.join(output, name) for name in self.file_names()]
+        else:
+            paths = [output]
+            if workers <= 1:
+                self.write_pages(output)
+                if progress:
+                    progress(count, count)
+                return paths
+        
+        # Several parts per worker so progress moves steadily
+        part_size = max(1, -(-count // (workers * 4)))
+        bounds = [(start, min(start + part_size, count)) for start in range(0, count, part_size)]
+        temp_dir = None if per_student else tempfile.mkdtemp(prefix="report_cards_")
+        targets = [paths[start:stop] if per_student else os.path.join(temp_dir, f"part-{i:05d}.pdf")
+                   for i, (start, stop) in enumerate(bounds)]
+        
+        try:
+            done = 0
+            if workers <= 1:
+                for (start, stop), target in zip(bounds, targets):
+                    _write_report_cards(self.subset(start, stop), target)
+                    done += stop - start
+                    if progress:
+                        progress(done, count)
+            else:
+                with spawned_process_pool(workers) as executor:
+                    futures = {executor.submit(_write_report_cards, self.subset(start, stop), target): stop - start
+                               for (start, stop), target in zip(bounds, targets)}
+                    for future in as_completed(futures):
+                        future.result()
+                        done += futures[future]
+                        if progress:
+                            progress(done, count)
+            
+            if not per_student:
+                from pypdf import PdfWriter
+                writer = PdfWriter()
+                for target in targets:
+                    writer.append(target)
+                with open(output, "wb") as f:
+                    writer.write(f)
+        finally:
+            if temp_dir is not None:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+        return paths
+
+
+class LazyChart:
+    """One chart of an analysis, drawn the first time its figure is needed"""
+    def __init__(self, title, figsize, draw):
+        self.title = title
+        self.figsize = figsize
+        self.draw = draw
+        self.figure = None
+    
+    def get_figure(self):
+        if self.figure is None:
+            with TRACER.span("draw chart", chart=self.title):
+                self.figure = self.draw()
+        return self.figure
+
+
+class LazyChartPanel:
+    """Scrollable column of LazyCharts that are rendered on demand
+    
+    Every chart first gets a placeholder frame of the figure's size, so the
+    panel appears immediately with the right scroll range. Charts are then
+    rendered one per idle tick: those in the viewport first, the rest in
+    order of position, so the charts a user looks at never wait for the others.
+    """
+    def __init__(self, root, canvas, frame, charts, delay=10, on_render=None):
+        self.root = root
+        self.canvas = canvas
+        self.charts = charts
+        self.delay = delay
+        self.on_render = on_render
+        self.pending = None
+        dpi = plt.rcParams["figure.dpi"]
+        
+        self.slots = []
+        for chart in charts:
+            chart_frame = ttk.LabelFrame(frame, text=chart.title, padding="10")
+            chart_frame.pack(fill=tk.X, padx=10, pady=5)
+            placeholder = ttk.Frame(chart_frame, width=int(chart.figsize[0] * dpi), height=int(chart.figsize[1] * dpi))
+            placeholder.pack(fill=tk.BOTH, expand=True)
+            ttk.Label(placeholder, text="Loading chart...").place(relx=0.5, rely=0.5, anchor="center")
+            self.slots.append([chart_frame, placeholder])
+        
+        self.schedule()
+    
+    def schedule(self, delay=None):
+        """Render the next chart after delay ms (sooner requests replace later ones)"""
+        if self.pending is not None:
+            self.root.after_cancel(self.pending)
+        self.pending = self.root.after(self.delay if delay is None else delay, self.step)
+    
+    def visible(self):
+        """Indices of the charts that intersect the viewport"""
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        return [i for i, (chart_frame, _) in enumerate(self.slots)
+                if chart_frame.winfo_y() < bottom and chart_frame.winfo_y() + chart_frame.winfo_height() > top]
+    
+    def step(self):
+        self.pending = None
+        if not self.canvas.winfo_exists():
+            return  # The panel was replaced
+        
+        unrendered = [i for i, (_, placeholder) in enumerate(self.slots) if placeholder is not None]
+        if not unrendered:
+            return
+        visible = [i for i in self.visible() if i in unrendered]
+        self.render((visible or unrendered)[0])
+        self.schedule()
+    
+    def render(self, index):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        
+        chart_frame, placeholder = self.slots[index]
+        with TRACER.span("render chart", chart=self.charts[index].title):
+            figure = self.charts[index].get_figure()
+            placeholder.destroy()
+            self.slots[index][1] = None
+            
+            with TRACER.span("FigureCanvasTkAgg draw"):
+                canvas = FigureCanvasTkAgg(figure, master=chart_frame)
+                canvas.draw()
+                canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        if self.on_render is not None:
+            self.on_render()
+    
+    def on_scroll(self):
+        """Charts scrolled into view are rendered right away"""
+        self.schedule(0)
+
+
+class FigureRegistry:
+    """Owner of the matplotlib figures drawn for the analysis panels
+    
+    pyplot keeps every figure alive until plt.close(), so figures are tracked
+    per LazyChart: charts of the panel on screen are pinned, charts of replaced
+    panels stay drawn in an LRU (for re-opening or export) as long as all
+    figures fit in budget_bytes, and evicted or released charts are closed
+    (they are drawn again if they are ever shown again).
+    """
+    def __init__(self, budget_bytes=256 * 1024 ** 2):
+        self.budget_bytes = budget_bytes
+        self.pinned = []
+        self.recent = OrderedDict()
+        self.released = set()
+    
+    @staticmethod
+    def figure_bytes(figure):
+        """Estimated memory of a figure: RGBA buffers of the Agg renderer and Tk image plus plotted data"""
+        width, height = figure.canvas.get_width_height()
+        size = 2 * width * height * 4
+        for ax in figure.axes:
+            size += sum(line.get_xydata().nbytes for line in ax.lines)
+            size += sum(np.asarray(collection.get_offsets()).nbytes for collection in ax.collections)
+            size += 1024 * len(ax.patches)
+        return size
+    
+    def charts(self):
+        """All charts that currently hold a drawn figure"""
+        return [chart for chart in self.pinned + list(self.recent.values()) if chart.figure is not None]
+    
+    def memory(self):
+        """Estimated memory of all open figures in bytes"""
+        return sum(self.figure_bytes(chart.figure) for chart in self.charts())
+    
+    def close(self, chart):
+        if chart.figure is not None:
+            plt.close(chart.figure)
+            chart.figure = None
+    
+    def show(self, charts):
+        """Pin the charts of a new panel; charts of the replaced panel become evictable"""
+        for chart in self.pinned:
+            if chart in charts:
+                continue
+            if id(chart) in self.released:
+                self.released.discard(id(chart))
+                self.close(chart)
+            else:
+                self.recent[id(chart)] = chart
+                self.recent.move_to_end(id(chart))
+        
+        for chart in charts:
+            self.recent.pop(id(chart), None)
+            self.released.discard(id(chart))
+        self.pinned = list(charts)
+        self.evict()
+    
+    def release(self, charts):
+        """Close the figures of charts that are no longer needed (e.g. of outdated data)"""
+        pinned = {id(chart) for chart in self.pinned}
+        for chart in charts:
+            if id(chart) in pinned:
+                self.released.add(id(chart))  # Closed once its panel is replaced
+            else:
+                self.recent.pop(id(chart), None)
+                self.close(chart)
+    
+    def evict(self):
+        """Close least recently shown figures until all figures fit in the budget"""
+        total = self.memory()
+        while total > self.budget_bytes and self.recent:
+            _, chart = self.recent.popitem(last=False)
+            if chart.figure is not None:
+                total -= self.figure_bytes(chart.figure)
+                self.close(chart)
+
+
+class VirtualTable:
+    """Virtualized DataFrame view on a ttk.Treeview
+    
+    Only the rows in the visible viewport are Treeview items. They are fetched
+    by position from the DataFrame (plus a buffer of rows around the viewport)
+    whenever the view scrolls, so tables of any size display immediately.
+    """
+    def __init__(self, tree, scrollbar, buffer_rows=100):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.buffer_rows = buffer_rows
+        self.data = None
+        self.first = 0
+        self.visible_rows = 25
+        self.block_start = 0
+        self.block = None
+        
+        # The scrollbar now tracks the position in the DataFrame, not in the Treeview
+        self.tree.configure(yscrollcommand="")
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_to(self.first - 3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_to(self.first + 3))
+        self.tree.bind("<Prior>", lambda e: self.scroll_to(self.first - self.visible_rows))
+        self.tree.bind("<Next>", lambda e: self.scroll_to(self.first + self.visible_rows))
+        
+    def set_data(self, data, width=100):
+        """Show a new DataFrame, starting at the top"""
+        self.data = data
+        self.first = 0
+        self.block = None
+        
+        if self.tree.get_children():
+            self.tree.delete(*self.tree.get_children())
+        self.tree["columns"] = list(data.columns)
+        self.tree["show"] = "headings"
+        for col in data.columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor=tk.CENTER)
+        
+        with TRACER.span("Treeview rows", rows=len(data)):
+            self.refresh()
+    
+    def rows(self, start, stop):
+        """Rows [start, stop) as lists of values, served from the buffered block"""
+        if self.block is None or start < self.block_start or stop > self.block_start + len(self.block):
+            self.block_start = max(0, start - self.buffer_rows)
+            self.block = self.data.iloc[self.block_start:stop + self.buffer_rows].to_numpy(dtype=object)
+        return self.block[start - self.block_start:stop - self.block_start].tolist()
+    
+    def refresh(self):
+        """Materialize the rows currently in the viewport"""
+        if self.data is None:
+            return
+        total = len(self.data)
+        rows = self.rows(self.first, min(self.first + self.visible_rows, total))
+        
+        # Reuse existing items, only adding or removing what the viewport size requires
+        items = self.tree.get_children()
+        for item, values in zip(items, rows):
+            self.tree.item(item, values=values)
+        for values in rows[len(items):]:
+            self.tree.insert("", tk.END, values=values)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        
+        if total:
+            self.scrollbar.set(self.first / total, min(self.first + self.visible_rows, total) / total)
+        else:
+            self.scrollbar.set(0, 1)
+    
+    def scroll_to(self, first):
+        if self.data is None:
+            return "break"
+        first = max(0, min(int(first), len(self.data) - self.visible_rows))
+        if first != self.first:
+            self.first = first
+            self.refresh()
+        return "break"
+    
+    def yview(self, *args):
+        """Scrollbar command ('moveto', fraction) or ('scroll', n, 'units'/'pages')"""
+        if self.data is None:
+            return
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.data))
+        elif args[0] == "scroll":
+            step = self.visible_rows if args[2] == "pages" else 1
+            self.scroll_to(self.first + int(args[1]) * step)
+    
+    def on_mousewheel(self, event):
+        # Only the sign counts: Windows reports multiples of 120, macOS +-1
+        return self.scroll_to(self.first + (-3 if event.delta > 0 else 3))
+    
+    def on_resize(self, event):
+        row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+        # Leave room for the heading row
+        visible_rows = max(1, (event.height - row_height - 5) // row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            if self.data is not None:
+                self.first = max(0, min(self.first, len(self.data) - visible_rows))
+            self.refresh()
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task when the user cancels it"""
+
+
+class BackgroundTask:
+    """Progress and cancellation handle passed to a background job"""
+    def __init__(self):
+        self.cancel_event = threading.Event()
+        self.fraction = None
+        self.message = ""
+        
+    def progress(self, fraction=None, message=None):
+        """Report progress (fraction in 0..1, None for unknown) and stop here if cancelled"""
+        self.check()
+        self.fraction = fraction
+        if message is not None:
+            self.message = message
+    
+    def check(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+    
+    def cancel(self):
+        self.cancel_event.set()
+
+
+class TaskRunner:
+    """Runs heavy jobs in a worker thread so the Tk main loop stays responsive
+    
+    A job is a function taking a BackgroundTask; its result is handed to
+    on_done on the main thread via root.after. The progress bar and Cancel
+    button live in the given parent frame. Only one job runs at a time.
+    """
+    def __init__(self, root, parent):
+        self.root = root
+        self.task = None
+        self.outcome = None
+        
+        self.status = tk.StringVar(value="Ready")
+        ttk.Label(parent, textvariable=self.status).pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(parent, text="Cancel", command=self.cancel, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT, padx=5)
+        self.progress_bar = ttk.Progressbar(parent, length=200, mode="determinate", maximum=1.0)
+        self.progress_bar.pack(side=tk.RIGHT, padx=5)
+        
+    def busy(self):
+        return self.task is not None
+    
+    def run(self, name, job, on_done=None, error_title="Error"):
+        """Start job in the background; returns False if another job is still running"""
+        if self.busy():
+            messagebox.showwarning("Warning", f"Please wait until '{self.name}' has finished")
+            return False
+        
+        self.name = name
+        self.on_done = on_done
+        self.error_title = error_title
+        self.task = BackgroundTask()
+        self.outcome = None
+        self.status.set(f"{name}...")
+        self.cancel_button.config(state=tk.NORMAL)
+        
+        def worker(task=self.task):
+            try:
+                with TRACER.span(f"{name} (background)"):
+                    self.outcome = ("done", job(task))
+            except TaskCancelled:
+                self.outcome = ("cancelled", None)
+            except Exception as e:
+                self.outcome = ("error", e)
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.poll()
+        return True
+    
+    def poll(self):
+        """Mirror the job's progress in the UI and deliver its result when finished"""
+        if self.outcome is None:
+            if self.task.fraction is None:
+                self.progress_bar.config(mode="indeterminate")
+                self.progress_bar.step(0.05)
+            else:
+                self.progress_bar.config(mode="determinate", value=self.task.fraction)
+            if self.task.message:
+                self.status.set(f"{self.name}: {self.task.message}")
+            self.root.after(100, self.poll)
+            return
+        
+        state, result = self.outcome
+        self.task = None
+        self.progress_bar.config(mode="determinate", value=0)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status.set("Ready" if state == "done" else f"{self.name} {state}")
+        
+        if state == "done" and self.on_done is not None:
+            with TRACER.span(f"{self.name}: show result"):
+                self.on_done(result)
+        elif state == "error":
+            messagebox.showerror(self.error_title, f"{self.name} failed: {str(result)}")
+    
+    def cancel(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.status.set(f"Cancelling {self.name}...")
+
+
+def read_data_file(file_path):
+    """Read a whole CSV or Excel grade file into a DataFrame"""
+    # Choose appropriate reading method based on file extension
+    if file_path.endswith('.csv'):
+        return pd.read_csv(file_path)
+    return pd.read_excel(file_path)
+
+
+@traced("compact dtypes")
+def compact_dtypes(data, subjects=SUBJECTS, category_ratio=0.5):
+    """Downcast a grade table to a compact schema
+    
+    Integer score columns get the smallest integer type that holds both the
+    configured SUBJECTS range and the observed values, other numeric columns
+    become float32, and the Class column and other low-cardinality text columns
+    become categoricals (so class codes are factorized once at load). Returns
+    the compact table and its memory use before and after in bytes.
+    """
+    before = data.memory_usage(deep=True).sum()
+    ranges = {subj["name"]: (subj["min"], subj["max"]) for subj in subjects}
+    compact = {}
+    
+    for col in data.columns:
+        values = data[col]
+        if pd.api.types.is_bool_dtype(values) or isinstance(values.dtype, pd.CategoricalDtype):
+            compact[col] = values
+        elif pd.api.types.is_numeric_dtype(values) and values.isna().all():
+            # Empty or all-missing column: nothing to size the dtype from
+            compact[col] = values
+        elif pd.api.types.is_numeric_dtype(values):
+            if values.isna().any() or not np.array_equal(values, np.round(values)):
+                compact[col] = values.astype(np.float32) if values.dtype.itemsize > 4 else values
+                continue
+            low, high = values.min(), values.max()
+            if col in ranges:
+                low, high = min(low, *ranges[col]), max(high, *ranges[col])
+            for dtype in (np.int8, np.int16, np.int32, np.int64):
+                if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                    compact[col] = values.astype(dtype)
+                    break
+        elif col == "Class" or (len(values) and values.nunique() / len(values) < category_ratio):
+            compact[col] = values.astype("category")
+        else:
+            compact[col] = values
+    
+    compact = pd.DataFrame(compact, index=data.index)
+    return compact, before, compact.memory_usage(deep=True).sum()
+
+
+def widened_dtype(values, dtype):
+    """dtype for storing values in a (compact) integer column of dtype
+    
+    dtype itself when every value is a whole number in its range, int64 for
+    larger whole numbers, and float64 for fractional or missing values.
+    """
+    values = pd.to_numeric(pd.Series(values), errors='coerce')
+    if values.isna().any() or not values.eq(values.round()).all():
+        return np.dtype(np.float64)
+    limits = np.iinfo(dtype)
+    if len(values) and (values.min() < limits.min or values.max() > limits.max):
+        return np.dtype(np.int64)
+    return dtype
+
+
+def binned_counts_2d(x, y, max_bins=120):
+    """2D histogram of two score arrays, one bin per point on the integer score grid
+    
+    Scores that are not whole points, or ranges wider than max_bins points,
+    fall back to max_bins equal-width bins; a constant column gets a single
+    bin. Returns x edges, y edges and the counts indexed [x bin, y bin].
+    """
+    edges = []
+    for values in (x, y):
+        low, high = np.floor(values.min()), np.ceil(values.max())
+        if values.min() == values.max():
+            edges.append(np.array([values.min() - 0.5, values.min() + 0.5]))
+        elif high - low < max_bins and np.array_equal(values, np.rint(values)):
+            edges.append(np.arange(low - 0.5, high + 1.5))
+        else:
+            edges.append(np.linspace(values.min(), values.max(), max_bins + 1))
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=edges)
+    return x_edges, y_edges, counts
+
+
+class AnalysisCache:
+    """Analysis results keyed by data version and analysis parameters
+    
+    Entries are only valid for the data version they were computed from;
+    invalidate() drops everything computed from an older version.
+    """
+    def __init__(self):
+        self.version = 0
+        self.results = {}
+    
+    def get(self, key, version):
+        """Cached result for key at the given data version, or None"""
+        return self.results.get((version, key))
+    
+    def put(self, key, version, result):
+        """Store result (unless its data version is already stale) and return it"""
+        if version == self.version:
+            self.results[(version, key)] = result
+        return result
+    
+    def invalidate(self, version):
+        """Make version current, evict results of all other versions and return the evicted results"""
+        self.version = version
+        evicted = [result for entry, result in self.results.items() if entry[0] != version]
+        self.results = {entry: result for entry, result in self.results.items() if entry[0] == version}
+        return evicted
+
+
+class ScoreStore:
+    """Out-of-core grade table with the scores in a memory-mapped .npy matrix
+    
+    scores.npy holds one float32 row per record with the subject columns (and
+    Total Score, if the file has one); missing scores are NaN. The other
+    columns (No., Student ID, Name, Class, ...) are kept in the side table
+    info.csv. Analyses read both in blocks of block_rows records, so memory use
+    does not grow with the number of records.
+    """
+    def __init__(self, directory, block_rows=100000):
+        import json
+        
+        self.directory = directory
+        self.block_rows = block_rows
+        with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.columns = meta["columns"]
+        self.score_columns = meta["score_columns"]
+        self.info_columns = meta["info_columns"]
+        self.scores = np.load(os.path.join(directory, "scores.npy"), mmap_mode="r")
+        self.records = len(self.scores)
+    
+    @staticmethod
+    def exists(directory):
+        # meta.json is written last, so it marks a complete store
+        return os.path.exists(os.path.join(directory, "meta.json"))
+    
+    @classmethod
+    def build(cls, file_path, directory, chunksize=100000, task=None):
+        """Convert a CSV or Excel grade file into a store, one chunk at a time"""
+        import json
+        
+        task = task or BackgroundTask()
+        os.makedirs(directory, exist_ok=True)
+        raw_path = os.path.join(directory, "scores.raw")
+        info_path = os.path.join(directory, "info.csv")
+        columns = score_columns = info_columns = None
+        records = 0
+        
+        try:
+            # The row count is unknown until the end, so scores are first appended to a raw file
+            with open(raw_path, "wb") as raw:
+                for chunk in iter_data_chunks(file_path, chunksize):
+                    if columns is None:
+                        columns = [str(col) for col in chunk.columns]
+                        score_columns = [col for col in chunk.columns
+                                         if col not in ["No.", "Student ID", "Name", "Class", "Rank"]
+                                         and pd.api.types.is_numeric_dtype(chunk[col])]
+                        info_columns = [col for col in chunk.columns if col not in score_columns]
+                    
+                    scores = chunk[score_columns].apply(pd.to_numeric, errors='coerce')
+                    scores.to_numpy(dtype=np.float32).tofile(raw)
+                    chunk[info_columns].to_csv(info_path, mode="a", header=records == 0, index=False)
+                    records += len(chunk)
+                    task.progress(None, f"{records} records stored")
+            
+            if columns is None:
+                raise ValueError("The file contains no records")
+            
+            # Copy into a .npy file block by block now that the shape is known
+            shape = (records, len(score_columns))
+            matrix = np.lib.format.open_memmap(os.path.join(directory, "scores.npy"), mode="w+",
+                                               dtype=np.float32, shape=shape)
+            raw = np.memmap(raw_path, dtype=np.float32, mode="r", shape=shape)
+            for start in range(0, records, chunksize):
+                task.progress(start / records, "writing score matrix")
+                matrix[start:start + chunksize] = raw[start:start + chunksize]
+            matrix.flush()
+            del matrix, raw
+            os.remove(raw_path)
+            
+            with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"columns": columns, "score_columns": score_columns, "info_columns": info_columns}, f)
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        
+        return cls(directory)
+    
+    @property
+    def subject_columns(self):
+        return [col for col in self.score_columns if col != "Total Score"]
+    
+    def iter_blocks(self, info_columns=()):
+        """Yield DataFrames of block_rows records with the score columns and the requested info columns"""
+        info_reader = None
+        if info_columns:
+            info_reader = pd.read_csv(os.path.join(self.directory, "info.csv"),
+                                      usecols=list(info_columns), chunksize=self.block_rows)
+        
+        for start in range(0, self.records, self.block_rows):
+            block = pd.DataFrame(self.scores[start:start + self.block_rows], columns=self.score_columns)
+            if info_reader is not None:
+                block = pd.concat([next(info_reader).reset_index(drop=True), block], axis=1)
+            yield block
+    
+    def aggregates(self, task=None):
+        """Per-subject aggregates computed in one blockwise pass over the score matrix"""
+        task = task or BackgroundTask()
+        summary = StreamingAggregates()
+        read = 0
+        for block in self.iter_blocks([col for col in ["Name"] if col in self.info_columns]):
+            summary.update(block)
+            read += len(block)
+            task.progress(read / max(self.records, 1), f"{read} of {self.records} records")
+        summary.columns = self.columns
+        return summary
+    
+    def preview(self, rows=1000):
+        """The first rows records with all columns, in the file's column order"""
+        info = pd.read_csv(os.path.join(self.directory, "info.csv"), nrows=rows)
+        scores = pd.DataFrame(self.scores[:rows], columns=self.score_columns)
+        return pd.concat([info, scores], axis=1)[self.columns]
+
+
+class ImportCache:
+    """Columnar binary cache of imported grade files
+    
+    Each imported file is stored once as an uncompressed Feather file keyed by
+    its path, size and modification time, so loading it again skips CSV/Excel
+    parsing and the cached file can be memory-mapped. The cache directory,
+    including the memory-mapped ScoreStores under stores/, is kept under
+    max_bytes by evicting the least recently used entries. Caching is skipped
+    when pyarrow is not installed.
+    """
+    def __init__(self, cache_dir=None, max_bytes=1024 ** 3):
+        self.cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), ".student_grade_cache")
+        self.max_bytes = max_bytes
+        
+    def available(self):
+        try:
+            import pyarrow  # noqa: F401
+            return True
+        except ImportError:
+            return False
+    
+    def entry_path(self, file_path):
+        """Cache file for the current version of file_path"""
+        stat = os.stat(file_path)
+        path_key = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:16]
+        version_key = hashlib.sha1(f"{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{path_key}-{version_key}.feather")
+    
+    def store_path(self, file_path):
+        """Directory of the memory-mapped ScoreStore for the current version of file_path"""
+        name = os.path.splitext(os.path.basename(self.entry_path(file_path)))[0]
+        return os.path.join(self.cache_dir, "stores", name)
+    
+    def open_store(self, file_path, task=None):
+        """Open the ScoreStore of file_path, building it (and dropping older versions) on a miss"""
+        directory = self.store_path(file_path)
+        if ScoreStore.exists(directory):
+            os.utime(os.path.join(directory, "meta.json"))  # Mark as recently used
+            return ScoreStore(directory)
+        
+        stores_dir = os.path.dirname(directory)
+        path_key = os.path.basename(directory).split("-")[0]
+        if os.path.isdir(stores_dir):
+            for name in os.listdir(stores_dir):
+                if name.startswith(path_key + "-"):
+                    shutil.rmtree(os.path.join(stores_dir, name), ignore_errors=True)
+        store = ScoreStore.build(file_path, directory, task=task)
+        self.evict(keep=directory)
+        return store
+    
+    def load(self, file_path, reader=read_data_file):
+        """Load file_path from the cache, reading it with reader (and caching it) on a miss"""
+        if not self.available():
+            with TRACER.span("parse file", file=file_path):
+                return reader(file_path)
+        
+        entry = self.entry_path(file_path)
+        if os.path.exists(entry):
+            import pyarrow.feather as feather
+            
+            try:
+                with TRACER.span("read import cache", file=file_path):
+                    data = feather.read_table(entry, memory_map=True).to_pandas()
+                os.utime(entry)  # Mark as recently used
+                return data
+            except Exception:
+                # A corrupt or truncated entry is a cache miss
+                self.discard(entry)
+        
+        with TRACER.span("parse file", file=file_path):
+            data = reader(file_path)
+        with TRACER.span("write import cache"):
+            self.store(entry, data)
+        return data
+    
+    @staticmethod
+    def discard(path):
+        """Remove a cache file (or store directory) if possible"""
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    
+    def store(self, entry, data):
+        """Write a cache entry, replacing older versions of the same file
+        
+        Any failure only skips caching: the cache directory may not be
+        writable, and not every table can be stored as Feather (e.g.
+        mixed-type columns).
+        """
+        temp_path = entry + ".tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path_key = os.path.basename(entry).split("-")[0]
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(path_key + "-"):
+                    self.discard(os.path.join(self.cache_dir, name))
+            
+            data.to_feather(temp_path, compression="uncompressed")
+            os.replace(temp_path, entry)
+            self.evict(keep=entry)
+        except Exception:
+            self.discard(temp_path)
+    
+    def entries(self):
+        """Cache files and complete store directories as (path, size, last use) tuples, least recently used first"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".feather"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((os.path.join(self.cache_dir, name), stat.st_size, stat.st_mtime))
+        
+        stores_dir = os.path.join(self.cache_dir, "stores")
+        if os.path.isdir(stores_dir):
+            for name in os.listdir(stores_dir):
+                directory = os.path.join(stores_dir, name)
+                if ScoreStore.exists(directory):
+                    size = sum(os.path.getsize(os.path.join(directory, file)) for file in os.listdir(directory))
+                    entries.append((directory, size, os.stat(os.path.join(directory, "meta.json")).st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+    
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+    
+    def evict(self, keep=None):
+        """Remove least recently used entries (except keep) until the cache fits in max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self.discard(path)
+            total -= size
+    
+    def clear(self):
+        """Remove all cache entries (and memory-mapped stores) and return the number of bytes freed"""
+        freed = 0
+        for path, size, _ in self.entries():
+            self.discard(path)
+            freed += size
+        
+        # Incomplete stores left by interrupted builds
+        stores_dir = os.path.join(self.cache_dir, "stores")
+        if os.path.isdir(stores_dir):
+            for root, _, files in os.walk(stores_dir):
+                freed += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+            shutil.rmtree(stores_dir)
+        return freed
+
+
+class StudentGradeAnalysisSystem:
+    def __init__(self, root):
+        self.root = root
+        
+        # Data storage
+        self.data = None
+        self.analysis_results = None
+        self.current_file = None
+        # Aggregates of a file imported in streaming mode (self.data stays None)
+        self.stream_summary = None
+        # Memory-mapped scores of a file imported out of core (self.data stays None)
+        self.score_store = None
+        
+        # Bumped whenever self.data changes; cached analysis results are keyed by it
+        self.data_version = 0
+        self.analysis_cache = AnalysisCache()
+        # Per-subject running statistics of self.data, kept up to date by append_records/correct_record
+        self.running_stats = None
+        self.running_stats_version = None
+        
+        # Binary cache that makes re-importing the same file fast
+        self.import_cache = ImportCache()
+        
+        # Closes figures of replaced panels beyond a memory budget
+        self.figure_registry = FigureRegistry()
+        
+        # Headless (root is None): analyses and reports without any Tk widgets
+        if self.root is None:
+            return
+        
+        self.root.title("Simple Student Grade Analysis System Based on Python")
+        self.root.geometry("1200x800")
+        self.root.minsize(1000, 700)
+        
+        # Create data generator instance
+        self.data_generator = StudentDataGenerator(self.root, on_use=self.load_generated_data)
+        
+        # Create main interface
+        self.create_widgets()
+        
+    def create_widgets(self):
+        # Create menu bar
+        self.create_menu()
+        
+        # Status bar with progress of background tasks (at the very bottom)
+        status_frame = ttk.Frame(self.root, padding=(10, 0, 10, 5))
+        status_frame.pack(fill=tk.X, side=tk.BOTTOM)
+        self.task_runner = TaskRunner(self.root, status_frame)
+        
+        # Create analysis button area (at the top)
+        analysis_frame = ttk.Frame(self.root, padding="10")
+        analysis_frame.pack(fill=tk.X, side=tk.BOTTOM)
+        
+        # Analysis buttons
+        ttk.Button(
+            analysis_frame, 
+            text="Basic Statistical Analysis", 
+            command=self.perform_basic_analysis
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(
+            analysis_frame, 
+            text="Subject Comparison Analysis", 
+            command=self.perform_subject_analysis
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(
+            analysis_frame, 
+            text="Grade Distribution Analysis", 
+            command=self.perform_distribution_analysis
+        ).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(
+            analysis_frame, 
+            text="Advanced Analysis", 
+            command=self.perform_advanced_analysis
+        ).pack(side=tk.LEFT, padx=5)
         
         ttk.Button(
             analysis_frame, 
@@ -466,6 +2668,12 @@ class StudentGradeAnalysisSystem:
             command=self.generate_pdf_report
         ).pack(side=tk.RIGHT, padx=5)
         
+        ttk.Button(
+            analysis_frame, 
+            text="Generate Report Cards", 
+            command=self.generate_report_cards
+        ).pack(side=tk.RIGHT, padx=5)
+        
         # Create main frame
         main_frame = ttk.Frame(self.root, padding="10")
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -497,6 +2705,9 @@ class StudentGradeAnalysisSystem:
         scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.pack(fill=tk.BOTH, expand=True)
         
+        # Only the visible rows are inserted into the Treeview
+        self.table = VirtualTable(self.tree, scrollbar_y)
+        
         # Create right panel (analysis results) - take remaining space
         right_frame = ttk.LabelFrame(main_frame, text="Analysis Results", padding="10")
         right_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=(10, 0))
@@ -512,6 +2723,77 @@ class StudentGradeAnalysisSystem:
         # Visualization tab
         self.visual_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.visual_frame, text="Data Visualization")
+        
+        # Performance tab (timing spans of the last runs)
+        self.performance_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.performance_frame, text="Performance")
+        self.create_performance_panel()
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+    
+    def create_performance_panel(self):
+        """Tree of the last runs and their timed phases, with refresh, clear and Chrome trace export"""
+        toolbar = ttk.Frame(self.performance_frame)
+        toolbar.pack(fill=tk.X, pady=(0, 5))
+        ttk.Button(toolbar, text="Refresh", command=self.refresh_performance_panel).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="Clear", command=self.clear_performance_spans).pack(side=tk.LEFT, padx=5)
+        ttk.Button(toolbar, text="Export Chrome Trace", command=self.export_performance_trace).pack(side=tk.RIGHT, padx=5)
+        
+        tree_frame = ttk.Frame(self.performance_frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        scrollbar = ttk.Scrollbar(tree_frame)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.performance_tree = ttk.Treeview(tree_frame, columns=("duration", "thread", "details"),
+                                             yscrollcommand=scrollbar.set)
+        self.performance_tree.heading("#0", text="Span")
+        self.performance_tree.heading("duration", text="Duration (ms)")
+        self.performance_tree.heading("thread", text="Thread")
+        self.performance_tree.heading("details", text="Details")
+        self.performance_tree.column("#0", width=260)
+        self.performance_tree.column("duration", width=100, anchor=tk.E)
+        self.performance_tree.column("thread", width=110, anchor=tk.CENTER)
+        self.performance_tree.column("details", width=200)
+        self.performance_tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.performance_tree.yview)
+    
+    def on_tab_changed(self, event):
+        if self.notebook.select() == str(self.performance_frame):
+            self.refresh_performance_panel()
+    
+    def refresh_performance_panel(self):
+        """Show the last runs (newest first) with their nested phases"""
+        tree = self.performance_tree
+        tree.delete(*tree.get_children())
+        
+        def insert(parent, record):
+            details = ", ".join(f"{key}={value}" for key, value in record["args"].items())
+            item = tree.insert(parent, tk.END, text=record["name"], values=(
+                f"{(record['end'] - record['start']) * 1000:.1f}", record["thread_name"], details))
+            for child in record["children"]:
+                insert(item, child)
+        
+        for run in TRACER.last_runs():
+            insert("", run)
+    
+    def clear_performance_spans(self):
+        TRACER.clear()
+        self.refresh_performance_panel()
+    
+    def export_performance_trace(self):
+        """Save the kept spans as a Chrome trace JSON file (open in chrome://tracing or Perfetto)"""
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            initialfile=f"grade_analysis_trace_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+        
+        try:
+            TRACER.export_chrome_trace(file_path)
+            messagebox.showinfo("Success", f"Trace of {len(TRACER.last_runs())} runs exported to:\n{file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Trace export failed: {str(e)}")
     
     def create_menu(self):
         menubar = tk.Menu(self.root)
@@ -519,14 +2801,20 @@ class StudentGradeAnalysisSystem:
         # File menu
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="Import Data", command=self.import_data)
+        file_menu.add_command(label="Import Large File (Streaming)", command=self.import_data_streaming)
+        file_menu.add_command(label="Import Larger-than-Memory File (Memory-Mapped)", command=self.import_data_memory_mapped)
+        file_menu.add_command(label="Append Records", command=self.append_records_from_file)
         file_menu.add_command(label="Save Data", command=self.save_data)
         file_menu.add_separator()
+        file_menu.add_command(label="Clear Import Cache", command=self.clear_import_cache)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         menubar.add_cascade(label="File", menu=file_menu)
         
         # Tools menu
         tools_menu = tk.Menu(menubar, tearoff=0)
         tools_menu.add_command(label="Student Data Generator", command=self.open_data_generator)
+        tools_menu.add_command(label="Figure Memory", command=self.show_figure_memory)
         menubar.add_cascade(label="Tools", menu=tools_menu)
         
         # Help menu
@@ -541,6 +2829,15 @@ class StudentGradeAnalysisSystem:
         """Open data generator window"""
         self.data_generator.show_generator_window()
     
+    def show_figure_memory(self):
+        """Report the memory used by open chart figures"""
+        registry = self.figure_registry
+        messagebox.showinfo(
+            "Figure Memory",
+            f"Open chart figures: {len(registry.charts())} ({len(plt.get_fignums())} in pyplot)\n"
+            f"Estimated memory: {registry.memory() / 1024 ** 2:.1f} MB "
+            f"(budget {registry.budget_bytes / 1024 ** 2:.0f} MB)")
+    
     def import_data(self):
         """Import data file"""
         file_path = filedialog.askopenfilename(
@@ -553,20 +2850,335 @@ class StudentGradeAnalysisSystem:
         
         if not file_path:
             return
-            
+            
+        def job(task):
+            task.progress(None, "reading file")
+            data = self.import_cache.load(file_path)
+            task.progress(None, "compacting columns")
+            return compact_dtypes(data)
+        
+        def on_done(result):
+            self.data, memory_before, memory_after = result
+            
+            self.analysis_results = None
+            self.current_file = file_path
+            self.stream_summary = None
+            self.score_store = None
+            self.mark_data_changed()
+            self.update_table()
+            messagebox.showinfo(
+                "Success",
+                f"Data imported successfully, total {len(self.data)} records\n"
+                f"Memory: {memory_before / 1024 ** 2:.1f} MB -> {memory_after / 1024 ** 2:.1f} MB "
+                f"({(memory_before - memory_after) / 1024 ** 2:.1f} MB saved)")
+        
+        self.task_runner.run("Import", job, on_done)
+    
+    def import_data_streaming(self, chunksize=100000):
+        """Import a large data file in chunks, keeping only running aggregates in memory"""
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("Excel files", "*.xlsx;*.xls"),
+                ("CSV files", "*.csv"),
+                ("All files", "*.*")
+            ]
+        )
+        
+        if not file_path:
+            return
+            
+        def job(task):
+            summary = StreamingAggregates()
+            for chunk in iter_data_chunks(file_path, chunksize):
+                summary.update(chunk)
+                task.progress(None, f"{summary.records} records read")
+            return summary
+        
+        def on_done(summary):
+            # The full table is never loaded; only a preview is shown
+            self.data = None
+            self.analysis_results = None
+            self.stream_summary = summary
+            self.score_store = None
+            self.current_file = file_path
+            self.mark_data_changed()
+            if summary.preview is not None:
+                self.update_table(summary.preview)
+            messagebox.showinfo(
+                "Success",
+                f"Data imported in streaming mode, total {summary.records} records\n"
+                f"(table shows the first {0 if summary.preview is None else len(summary.preview)} rows)")
+        
+        self.task_runner.run("Streaming import", job, on_done)
+    
+    def import_data_memory_mapped(self):
+        """Import a larger-than-memory file as a memory-mapped score matrix plus side table"""
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("Excel files", "*.xlsx;*.xls"),
+                ("CSV files", "*.csv"),
+                ("All files", "*.*")
+            ]
+        )
+        
+        if not file_path:
+            return
+        
+        def on_done(store):
+            self.data = None
+            self.analysis_results = None
+            self.stream_summary = None
+            self.score_store = store
+            self.current_file = file_path
+            self.mark_data_changed()
+            preview = store.preview()
+            self.update_table(preview)
+            messagebox.showinfo(
+                "Success",
+                f"Data imported as memory-mapped matrix, total {store.records} records\n"
+                f"(table shows the first {len(preview)} rows)")
+        
+        self.task_runner.run("Memory-mapped import",
+                             lambda task: self.import_cache.open_store(file_path, task), on_done)
+    
+    def out_of_core(self):
+        """Whether the dataset is only available as aggregates or a memory-mapped store"""
+        return self.data is None and (self.stream_summary is not None or self.score_store is not None)
+    
+    def with_summary(self, callback):
+        """Call callback with the per-subject aggregates of an out-of-core dataset
+        
+        For a memory-mapped store they are computed by one blockwise pass in the
+        background and cached for the current data version.
+        """
+        if self.score_store is None:
+            callback(self.stream_summary)
+            return
+        
+        key = ("aggregates",)
+        summary = self.analysis_cache.get(key, self.data_version)
+        if summary is not None:
+            callback(summary)
+            return
+        
+        version = self.data_version
+        self.task_runner.run(
+            "Reading score matrix",
+            self.score_store.aggregates,
+            lambda summary: callback(self.analysis_cache.put(key, version, summary)))
+    
+    @traced("load file")
+    def load_file(self, file_path):
+        """Load a grade file as the analysis dataset without any dialogs (headless use)"""
+        self.data, _, _ = compact_dtypes(read_data_file(file_path))
+        self.analysis_results = None
+        self.current_file = file_path
+        self.stream_summary = None
+        self.score_store = None
+        self.mark_data_changed()
+    
+    def build_figures(self, analysis_type):
+        """Build and select the charts of an analysis without showing them (headless use)"""
+        subject_columns = self.get_subject_columns()
+        if analysis_type == 'subject':
+            charts = self.build_subject_figures(subject_columns)
+        elif analysis_type == 'distribution':
+            charts = self.build_distribution_figures(self.prepare_distribution_analysis(subject_columns))
+        else:
+            charts = self.build_advanced_figures(subject_columns)
+        self.current_analysis_type = analysis_type
+        self.current_charts = charts
+        return charts
+    
+    def load_generated_data(self, data):
+        """Use data from the generator window as the analysis dataset"""
+        self.data, _, _ = compact_dtypes(data)
+        self.analysis_results = None
+        self.current_file = None
+        self.stream_summary = None
+        self.score_store = None
+        self.mark_data_changed()
+        self.update_table()
+        messagebox.showinfo("Success", f"Generated data loaded, total {len(self.data)} records")
+    
+    def mark_data_changed(self):
+        """Bump the data version and drop cached analysis results of older versions"""
+        self.data_version += 1
+        evicted = self.analysis_cache.invalidate(self.data_version)
+        self.figure_registry.release([chart for result in evicted if isinstance(result, list)
+                                      for chart in result if isinstance(chart, LazyChart)])
+    
+    def get_subject_columns(self):
+        """Columns treated as subjects (all columns except ID, name, class, total score and rank)"""
+        return [col for col in self.data.columns
+                if col not in ["No.", "Student ID", "Name", "Class", "Total Score", "Rank"]]
+    
+    def get_running_stats(self):
+        """Running statistics of self.data (built with one pass the first time or after the data changed)"""
+        if self.running_stats is None or self.running_stats_version != self.data_version:
+            self.running_stats = StreamingAggregates()
+            self.running_stats.update(self.data)
+            self.running_stats_version = self.data_version
+        return self.running_stats
+    
+    def get_correlation(self, subject_columns, method="pearson", data=None, version=None):
+        """Correlation matrix of the subject columns
+        
+        Pearson comes from the running cross-product sums (kept up to date by
+        append_records/correct_record); Spearman ranks data (default self.data)
+        and is cached for its data version.
+        """
+        if method == "pearson":
+            return self.get_running_stats().correlation.pearson().reindex(index=subject_columns, columns=subject_columns)
+        
+        data = self.data if data is None else data
+        version = self.data_version if version is None else version
+        key = ("spearman", tuple(subject_columns))
+        cached = self.analysis_cache.get(key, version)
+        if cached is not None:
+            return cached
+        return self.analysis_cache.put(key, version, CorrelationEngine(subject_columns).spearman(data))
+    
+    def get_class_statistics(self, subject_columns, data=None, version=None):
+        """Per-class metrics of the subject columns (rows indexed by grade and class), cached per data version"""
+        data = self.data if data is None else data
+        version = self.data_version if version is None else version
+        key = ("class_statistics", tuple(subject_columns))
+        cached = self.analysis_cache.get(key, version)
+        if cached is not None:
+            return cached
+        return self.analysis_cache.put(key, version, GroupAggregator.for_classes(data).aggregate(data, subject_columns))
+    
+    def derive_score_columns(self, records, given=()):
+        """Fill Total Score / Average Score of new or corrected records like basic analysis derives them"""
+        scores = [col for col in self.get_subject_columns() if col != "Average Score"]
+        if "Total Score" in self.data.columns and "Total Score" not in given:
+            records["Total Score"] = records[scores].sum(axis=1)
+        if "Average Score" in self.data.columns and "Average Score" not in given:
+            records["Average Score"] = records[scores].mean(axis=1)
+    
+    def records_changed(self, running):
+        """Publish incrementally updated running statistics as the current basic statistics"""
+        # Ranks are relative to all students, so they are the one column recomputed in full
+        if "Rank" in self.data.columns and "Total Score" in self.data.columns:
+            self.data["Rank"] = self.data["Total Score"].rank(ascending=False, method="min").astype(int)
+        
+        self.mark_data_changed()
+        self.running_stats_version = self.data_version
+        key = ("statistics", tuple(self.get_subject_columns()))
+        stats = self.analysis_cache.put(key, self.data_version, SubjectStatistics.from_aggregates(running))
+        # Exports and the PDF report use the updated statistics too
+        if self.analysis_results is not None:
+            self.use_statistics(stats)
+    
+    @traced("append records")
+    def append_records(self, records):
+        """Append late records to the loaded data, updating the running statistics without a rescan
+        
+        records is a DataFrame (or anything DataFrame() accepts) with the same
+        columns as the loaded data; missing derived columns are filled in.
+        Only the statistics are incremental: the table itself is concatenated,
+        which copies it, so append late records in batches rather than one
+        call per record. Returns the number of appended records.
+        """
+        records = pd.DataFrame(records).reset_index(drop=True)
+        
+        # Streaming mode: only the aggregates exist
+        if self.data is None:
+            if self.stream_summary is None:
+                raise ValueError("Records can only be appended to data loaded with Import Data or in streaming mode")
+            self.stream_summary.update(records)
+            self.mark_data_changed()
+            return len(records)
+        
+        running = self.get_running_stats()
+        given = set(records.columns)
+        if "No." in self.data.columns and "No." not in given:
+            records["No."] = np.arange(len(records)) + int(self.data["No."].max()) + 1
+        self.derive_score_columns(records, given)
+        records = records.reindex(columns=self.data.columns)
+        
+        # Keep the compact dtypes of the loaded table
+        for col, dtype in self.data.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype):
+                new_categories = pd.Index(records[col].dropna().unique()).difference(dtype.categories)
+                if len(new_categories):
+                    self.data[col] = self.data[col].cat.add_categories(new_categories)
+            elif pd.api.types.is_integer_dtype(dtype) and widened_dtype(records[col], dtype) != dtype:
+                # Fractional, out of range or missing values: let concat upcast the column
+                continue
+            try:
+                records[col] = records[col].astype(self.data[col].dtype)
+            except (ValueError, TypeError):
+                pass
+        
+        running.update(records)
+        self.data = pd.concat([self.data, records], ignore_index=True)
+        self.records_changed(running)
+        return len(records)
+    
+    @traced("correct record")
+    def correct_record(self, index, values):
+        """Change some values of one loaded record, updating the running statistics without a rescan"""
+        if self.data is None:
+            raise ValueError("No data loaded")
+        
+        running = self.get_running_stats()
+        old_record = self.data.loc[[index]].copy()
+        for col, value in values.items():
+            self.set_value(index, col, value)
+        
+        record = self.data.loc[[index]].copy()
+        self.derive_score_columns(record, set(values))
+        for col in ("Total Score", "Average Score"):
+            if col in self.data.columns:
+                self.set_value(index, col, record.at[index, col])
+        
+        running.remove(old_record)
+        running.update(self.data.loc[[index]])
+        self.records_changed(running)
+    
+    def set_value(self, index, col, value):
+        """Set one cell of the loaded data, widening a compact column the value does not fit"""
+        dtype = self.data[col].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and value not in dtype.categories:
+            self.data[col] = self.data[col].cat.add_categories([value])
+        elif pd.api.types.is_integer_dtype(dtype):
+            self.data[col] = self.data[col].astype(widened_dtype([value], dtype))
+        self.data.at[index, col] = value
+    
+    def append_records_from_file(self):
+        """Append the records of another grade file (e.g. late exam results) to the loaded data"""
+        if self.data is None and self.stream_summary is None:
+            messagebox.showwarning("Warning", "Please import data first")
+            return
+        
+        file_path = filedialog.askopenfilename(
+            filetypes=[
+                ("Excel files", "*.xlsx;*.xls"),
+                ("CSV files", "*.csv"),
+                ("All files", "*.*")
+            ]
+        )
+        
+        if not file_path:
+            return
+        
         try:
-            # Choose appropriate reading method based on file extension
-            if file_path.endswith('.csv'):
-                self.data = pd.read_csv(file_path)
-            else:  # Excel files
-                self.data = pd.read_excel(file_path)
-            
-            self.current_file = file_path
-            self.update_table()
-            messagebox.showinfo("Success", f"Data imported successfully, total {len(self.data)} records")
-            
+            count = self.append_records(read_data_file(file_path))
+            if self.data is not None:
+                self.update_table()
+            messagebox.showinfo("Success", f"Appended {count} records, statistics updated")
+        except Exception as e:
+            messagebox.showerror("Error", f"Append failed: {str(e)}")
+    
+    def clear_import_cache(self):
+        """Delete all cached copies of imported files"""
+        try:
+            freed = self.import_cache.clear()
+            messagebox.showinfo("Success", f"Import cache cleared ({freed / 1024 ** 2:.1f} MB freed)")
         except Exception as e:
-            messagebox.showerror("Error", f"Import failed: {str(e)}")
+            messagebox.showerror("Error", f"Clearing cache failed: {str(e)}")
     
     def save_data(self):
         """Save data"""
@@ -614,31 +3226,68 @@ class StudentGradeAnalysisSystem:
         except Exception as e:
             messagebox.showerror("Error", f"Export failed: {str(e)}")
     
-    def update_table(self):
-        """Update table data"""
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        # Set columns
-        self.tree["columns"] = list(self.data.columns)
-        self.tree["show"] = "headings"
-        
-        # Set column names
-        for col in self.data.columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100, anchor=tk.CENTER)
-        
-        # Fill data
-        for idx, row in self.data.iterrows():
-            self.tree.insert("", tk.END, values=list(row))
+    @traced("update_table")
+    def update_table(self, data=None):
+        """Update table data (defaults to the loaded data)"""
+        self.table.set_data(self.data if data is None else data)
     
+    @traced("perform_basic_analysis")
     def perform_basic_analysis(self):
         """Perform basic statistical analysis"""
+        if self.out_of_core():
+            self.with_summary(lambda summary: self.show_statistics(SubjectStatistics.from_aggregates(summary)))
+            return
+        
         if self.data is None:
             messagebox.showwarning("Warning", "Please import data first")
             return
-            
+        
+        stats = self.compute_basic_statistics()
+        
+        # Update table
+        self.update_table()
+        self.show_statistics(stats)
+    
+    @traced("basic statistics")
+    def compute_basic_statistics(self):
+        """Derive total/average/rank columns if missing and return the (cached) SubjectStatistics"""
+        # Identify subject columns (assume columns not ID or name are subjects)
+        subject_columns = self.get_subject_columns()
+        columns_before = len(self.data.columns)
+        
+        # Calculate total score (if not exists)
+        if "Total Score" not in self.data.columns and subject_columns:
+            self.data["Total Score"] = self.data[subject_columns].sum(axis=1)
+        
+        # Calculate average score (if not exists)
+        if "Average Score" not in self.data.columns and subject_columns:
+            self.data["Average Score"] = self.data[subject_columns].mean(axis=1)
+        
+        # Calculate ranking (if not exists)
+        if "Rank" not in self.data.columns and "Total Score" in self.data.columns:
+            self.data["Rank"] = self.data["Total Score"].rank(ascending=False, method="min").astype(int)
+        
+        # Derived columns change the dataset
+        if len(self.data.columns) != columns_before:
+            self.mark_data_changed()
+        
+        key = ("statistics", tuple(subject_columns))
+        stats = self.analysis_cache.get(key, self.data_version)
+        if stats is None:
+            stats = self.analysis_cache.put(key, self.data_version,
+                                            SubjectStatistics.from_data(self.data, subject_columns))
+        return stats
+    
+    def use_statistics(self, stats):
+        """Make a SubjectStatistics result the current analysis results (for export and the PDF report)"""
+        self.analysis_results = {
+            "basic_stats": stats.to_frame(),
+            "subject_columns": stats.subjects,
+            "statistics": stats
+        }
+    
+    def show_statistics(self, stats):
+        """Show a SubjectStatistics result in the statistical analysis panel"""
         # Clear statistical analysis panel
         for widget in self.stats_frame.winfo_children():
             widget.destroy()
@@ -656,67 +3305,42 @@ class StudentGradeAnalysisSystem:
         
         # Basic statistical information
         stats_text.insert(tk.END, "===== Basic Statistical Information =====\n\n")
-        stats_text.insert(tk.END, f"Total Records: {len(self.data)}\n")
-        
-        # Assuming "Name" column exists
-        if "Name" in self.data.columns:
-            stats_text.insert(tk.END, f"Student Count: {self.data['Name'].nunique()}\n\n")
+        stats_text.insert(tk.END, f"Total Records: {stats.records}\n")
         
-        # Identify subject columns (assume columns not ID or name are subjects)
-        subject_columns = []
-        for col in self.data.columns:
-            if col not in ["No.", "Student ID", "Name", "Class", "Total Score", "Rank"]:
-                subject_columns.append(col)
-        
-        # Calculate total score (if not exists)
-        if "Total Score" not in self.data.columns and subject_columns:
-            self.data["Total Score"] = self.data[subject_columns].sum(axis=1)
-        
-        # Calculate average score (if not exists)
-        if "Average Score" not in self.data.columns and subject_columns:
-            self.data["Average Score"] = self.data[subject_columns].mean(axis=1)
-        
-        # Calculate ranking (if not exists)
-        if "Rank" not in self.data.columns and "Total Score" in self.data.columns:
-            self.data["Rank"] = self.data["Total Score"].rank(ascending=False, method="min").astype(int)
-        
-        # Update table
-        self.update_table()
+        if stats.student_count is not None:
+            stats_text.insert(tk.END, f"Student Count: {stats.student_count}\n\n")
         
         # Subject statistics
         stats_text.insert(tk.END, "===== Subject Statistics =====\n\n")
-        for subject in subject_columns:
+        for subject, row in stats.table.iterrows():
             stats_text.insert(tk.END, f"{subject}:\n")
-            stats_text.insert(tk.END, f"  Average Score: {self.data[subject].mean():.2f}\n")
-            stats_text.insert(tk.END, f"  Highest Score: {self.data[subject].max()}\n")
-            stats_text.insert(tk.END, f"  Lowest Score: {self.data[subject].min()}\n")
-            stats_text.insert(tk.END, f"  Pass Rate: {((self.data[subject] >= 60).sum() / len(self.data) * 100):.2f}%\n")
-            stats_text.insert(tk.END, f"  Excellent Rate(>=90): {((self.data[subject] >= 90).sum() / len(self.data) * 100):.2f}%\n\n")
+            stats_text.insert(tk.END, f"  Average Score: {row['mean']:.2f}\n")
+            stats_text.insert(tk.END, f"  Highest Score: {row['max']:g}\n")
+            stats_text.insert(tk.END, f"  Lowest Score: {row['min']:g}\n")
+            stats_text.insert(tk.END, f"  Pass Rate: {row['pass_rate']:.2f}%\n")
+            stats_text.insert(tk.END, f"  Excellent Rate(>=90): {row['excellent_rate']:.2f}%\n\n")
         
         # Total score statistics
-        if "Total Score" in self.data.columns:
+        if stats.total is not None:
             stats_text.insert(tk.END, "===== Total Score Statistics =====\n\n")
-            stats_text.insert(tk.END, f"  Average Score: {self.data['Total Score'].mean():.2f}\n")
-            stats_text.insert(tk.END, f"  Highest Score: {self.data['Total Score'].max()}\n")
-            stats_text.insert(tk.END, f"  Lowest Score: {self.data['Total Score'].min()}\n\n")
+            stats_text.insert(tk.END, f"  Average Score: {stats.total['mean']:.2f}\n")
+            stats_text.insert(tk.END, f"  Highest Score: {stats.total['max']:g}\n")
+            stats_text.insert(tk.END, f"  Lowest Score: {stats.total['min']:g}\n\n")
         
         # Add more statistical functions
         stats_text.insert(tk.END, "===== Detailed Subject Statistics =====\n\n")
-        for subject in subject_columns:
+        for subject, row in stats.table.iterrows():
             stats_text.insert(tk.END, f"{subject}:")
-            stats_text.insert(tk.END, f"\n  Average Score: {self.data[subject].mean():.2f}")
-            stats_text.insert(tk.END, f"\n  Median: {self.data[subject].median():.2f}")
-            stats_text.insert(tk.END, f"\n  Standard Deviation: {self.data[subject].std():.2f}")
-            stats_text.insert(tk.END, f"\n  Minimum: {self.data[subject].min()}")
-            stats_text.insert(tk.END, f"\n  Maximum: {self.data[subject].max()}")
-            stats_text.insert(tk.END, f"\n  25th Percentile: {self.data[subject].quantile(0.25):.2f}")
-            stats_text.insert(tk.END, f"\n  75th Percentile: {self.data[subject].quantile(0.75):.2f}\n\n")
+            stats_text.insert(tk.END, f"\n  Average Score: {row['mean']:.2f}")
+            stats_text.insert(tk.END, f"\n  Median: {row['50%']:.2f}")
+            stats_text.insert(tk.END, f"\n  Standard Deviation: {row['std']:.2f}")
+            stats_text.insert(tk.END, f"\n  Minimum: {row['min']:g}")
+            stats_text.insert(tk.END, f"\n  Maximum: {row['max']:g}")
+            stats_text.insert(tk.END, f"\n  25th Percentile: {row['25%']:.2f}")
+            stats_text.insert(tk.END, f"\n  75th Percentile: {row['75%']:.2f}\n\n")
         
         # Save analysis results
-        self.analysis_results = {
-            "basic_stats": self.data.describe(),
-            "subject_columns": subject_columns
-        }
+        self.use_statistics(stats)
         
         # Make text box read-only
         stats_text.config(state=tk.DISABLED)
@@ -724,233 +3348,190 @@ class StudentGradeAnalysisSystem:
         # Switch to statistical analysis tab
         self.notebook.select(self.stats_frame)
     
+    @traced("perform_subject_analysis")
     def perform_subject_analysis(self):
         """Perform subject comparison analysis"""
+        if self.out_of_core():
+            self.with_summary(lambda summary: self.show_cached_figures(
+                'subject', summary.subject_columns,
+                lambda: self.build_subject_figures(summary.subject_columns, summary)))
+            return
+        
         if self.data is None:
             messagebox.showwarning("Warning", "Please import data first")
             return
-            
-        # Clear visualization panel
-        for widget in self.visual_frame.winfo_children():
-            widget.destroy()
         
         # Identify subject columns
-        subject_columns = []
-        for col in self.data.columns:
-            if col not in ["No.", "Student ID", "Name", "Class", "Total Score", "Rank"]:
-                subject_columns.append(col)
-        
+        subject_columns = self.get_subject_columns()
+        self.show_cached_figures('subject', subject_columns, lambda: self.build_subject_figures(subject_columns))
+    
+    def show_cached_figures(self, analysis_type, subject_columns, build):
+        """Show the charts of an analysis, calling build() only if none are cached for the current data"""
         if not subject_columns:
             messagebox.showwarning("Warning", "No subject columns identified")
             return
         
-        # Create a main frame to hold all charts
-        main_canvas = tk.Canvas(self.visual_frame)
-        scrollbar_v = ttk.Scrollbar(self.visual_frame, orient="vertical", command=main_canvas.yview)
-        scrollbar_h = ttk.Scrollbar(self.visual_frame, orient="horizontal", command=main_canvas.xview)
-        scrollable_frame = ttk.Frame(main_canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all"))
-        )
-
-        main_canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        main_canvas.configure(yscrollcommand=scrollbar_v.set, xscrollcommand=scrollbar_h.set)
-
-        # Position horizontal scrollbar at bottom of visualization interface
-        main_canvas.pack(side="top", fill="both", expand=True)
-        scrollbar_h.pack(side=tk.BOTTOM, fill=tk.X)
-        scrollbar_v.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Store all charts for export
-        self.current_figures = []
-        self.current_analysis_type = 'subject'  # Mark analysis type
-        
-        # 1. Average score comparison chart for each subject
-        avg_frame = ttk.LabelFrame(scrollable_frame, text="Average Score Comparison by Subject", padding="10")
-        avg_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        fig1, ax1 = plt.subplots(1, 1, figsize=(12, 6))
-        avg_scores = [self.data[subject].mean() for subject in subject_columns]
-        
-        # Use more attractive colors
-        colors = plt.cm.Set3(range(len(subject_columns)))
-        bars = ax1.bar(subject_columns, avg_scores, color=colors)
-        
-        # Add value labels
-        for bar, score in zip(bars, avg_scores):
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
-                    f'{score:.1f}', ha='center', va='bottom', fontweight='bold')
-        
-        ax1.set_title('Average Score Comparison by Subject', fontsize=14, fontweight='bold')
-        ax1.set_ylabel('Average Score')
-        ax1.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        # Auto-adjust x-axis label angle
-        if len(subject_columns) > 5:
-            plt.setp(ax1.get_xticklabels(), rotation=45, ha='right')
-        
-        plt.tight_layout()
-        
-        # Embed chart in frame
-        canvas1 = FigureCanvasTkAgg(fig1, master=avg_frame)
-        canvas1.draw()
-        canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        self.current_figures.append(fig1)
-        
-        # 2. Score distribution box plot for each subject
-        box_frame = ttk.LabelFrame(scrollable_frame, text="Score Distribution Box Plot by Subject", padding="10")
-        box_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        fig2, ax2 = plt.subplots(1, 1, figsize=(12, 6))
-        
-        # Prepare box plot data
-        box_data = [self.data[subject].dropna() for subject in subject_columns]
-        
-        # Create box plot
-        box_plot = ax2.boxplot(box_data, labels=subject_columns, patch_artist=True)
-        
-        # Beautify box plot
-        colors2 = plt.cm.Pastel1(range(len(subject_columns)))
-        for patch, color in zip(box_plot['boxes'], colors2):
-            patch.set_facecolor(color)
-            patch.set_alpha(0.8)
-        
-        # Set median line color
-        for median in box_plot['medians']:
-            median.set_color('red')
-            median.set_linewidth(2)
-        
-        ax2.set_title('Score Distribution Box Plot by Subject', fontsize=14, fontweight='bold')
-        ax2.set_ylabel('Score')
-        ax2.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        # Auto-adjust x-axis label angle
-        if len(subject_columns) > 5:
-            plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
-        
-        plt.tight_layout()
-        
-        # Embed chart in frame
-        canvas2 = FigureCanvasTkAgg(fig2, master=box_frame)
-        canvas2.draw()
-        canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        self.current_figures.append(fig2)
+        key = (analysis_type, tuple(subject_columns))
+        charts = self.analysis_cache.get(key, self.data_version)
+        if charts is None:
+            charts = self.analysis_cache.put(key, self.data_version, build())
+        self.show_figures(analysis_type, charts)
+    
+    @traced("build subject charts")
+    def build_subject_figures(self, subject_columns, summary=None):
+        """Build the subject comparison charts as LazyCharts
         
-        # Bind mouse wheel event
-        def _on_mousewheel(event):
-            main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        With summary (StreamingAggregates of an out-of-core dataset) the charts
+        are drawn from the aggregates instead of self.data.
+        """
+        # Data is taken now, drawing happens when a chart is first shown
+        if summary is None:
+            avg_scores = [self.data[subject].mean() for subject in subject_columns]
+            # Prepare box plot data
+            box_data = [self.data[subject].dropna() for subject in subject_columns]
+        else:
+            avg_scores = [summary.subjects[subject].mean() for subject in subject_columns]
+            box_stats = [summary.subjects[subject].box_stats(subject) for subject in subject_columns]
         
-        main_canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        def draw_averages():
+            # 1. Average score comparison chart for each subject
+            fig1, ax1 = plt.subplots(1, 1, figsize=(12, 6))
+            
+            # Use more attractive colors
+            colors = plt.cm.Set3(range(len(subject_columns)))
+            bars = ax1.bar(subject_columns, avg_scores, color=colors)
+            
+            # Add value labels
+            for bar, score in zip(bars, avg_scores):
+                height = bar.get_height()
+                ax1.text(bar.get_x() + bar.get_width()/2., height + 1,
+                        f'{score:.1f}', ha='center', va='bottom', fontweight='bold')
+            
+            ax1.set_title('Average Score Comparison by Subject', fontsize=14, fontweight='bold')
+            ax1.set_ylabel('Average Score')
+            ax1.grid(axis='y', linestyle='--', alpha=0.7)
+            
+            # Auto-adjust x-axis label angle
+            if len(subject_columns) > 5:
+                plt.setp(ax1.get_xticklabels(), rotation=45, ha='right')
+            
+            plt.tight_layout()
+            
+            return fig1
         
-        # Save first chart for export (for compatibility)
-        if self.current_figures:
-            self.current_fig = self.current_figures[0]
+        def draw_box_plot():
+            # 2. Score distribution box plot for each subject
+            fig2, ax2 = plt.subplots(1, 1, figsize=(12, 6))
+            
+            if summary is None:
+                # Create box plot (labels set on the axis: boxplot's labels argument was renamed in matplotlib 3.9)
+                box_plot = ax2.boxplot(box_data, patch_artist=True)
+                ax2.set_xticks(range(1, len(subject_columns) + 1), subject_columns)
+            else:
+                # Box statistics come from the score histograms
+                box_plot = ax2.bxp(box_stats, patch_artist=True)
+            
+            # Beautify box plot
+            colors2 = plt.cm.Pastel1(range(len(subject_columns)))
+            for patch, color in zip(box_plot['boxes'], colors2):
+                patch.set_facecolor(color)
+                patch.set_alpha(0.8)
+            
+            # Set median line color
+            for median in box_plot['medians']:
+                median.set_color('red')
+                median.set_linewidth(2)
+            
+            ax2.set_title('Score Distribution Box Plot by Subject', fontsize=14, fontweight='bold')
+            ax2.set_ylabel('Score')
+            ax2.grid(axis='y', linestyle='--', alpha=0.7)
+            
+            # Auto-adjust x-axis label angle
+            if len(subject_columns) > 5:
+                plt.setp(ax2.get_xticklabels(), rotation=45, ha='right')
+            
+            plt.tight_layout()
+            
+            return fig2
         
-        # Switch to visualization tab
-        self.notebook.select(self.visual_frame)
+        return [
+            LazyChart("Average Score Comparison by Subject", (12, 6), draw_averages),
+            LazyChart("Score Distribution Box Plot by Subject", (12, 6), draw_box_plot)
+        ]
     
+    @traced("perform_distribution_analysis")
     def perform_distribution_analysis(self):
         """Perform grade distribution analysis"""
+        if self.out_of_core():
+            # Aggregates already hold the histograms, so the charts are cheap to prepare
+            self.with_summary(lambda summary: self.show_cached_figures(
+                'distribution', summary.subject_columns,
+                lambda: self.build_distribution_figures(
+                    self.prepare_distribution_analysis(summary.subject_columns, summary=summary))))
+            return
+        
         if self.data is None:
             messagebox.showwarning("Warning", "Please import data first")
             return
-            
-        # Clear visualization panel
-        for widget in self.visual_frame.winfo_children():
-            widget.destroy()
         
         # Identify subject columns
-        subject_columns = []
-        for col in self.data.columns:
-            if col not in ["No.", "Student ID", "Name", "Class", "Total Score", "Rank"]:
-                subject_columns.append(col)
+        subject_columns = self.get_subject_columns()
         
         if not subject_columns:
             messagebox.showwarning("Warning", "No subject columns identified")
             return
         
-        # Create a main frame to hold all charts
-        main_canvas = tk.Canvas(self.visual_frame)
-        scrollbar_v = ttk.Scrollbar(self.visual_frame, orient="vertical", command=main_canvas.yview)
-        scrollbar_h = ttk.Scrollbar(self.visual_frame, orient="horizontal", command=main_canvas.xview)
-        scrollable_frame = ttk.Frame(main_canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all"))
-        )
-
-        main_canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        main_canvas.configure(yscrollcommand=scrollbar_v.set, xscrollcommand=scrollbar_h.set)
-
-        # Position horizontal scrollbar at bottom of visualization interface
-        main_canvas.pack(side="top", fill="both", expand=True)
-        scrollbar_h.pack(side=tk.BOTTOM, fill=tk.X)
-        scrollbar_v.pack(side=tk.RIGHT, fill=tk.Y)
+        key = ("distribution", tuple(subject_columns))
+        charts = self.analysis_cache.get(key, self.data_version)
+        if charts is not None:
+            self.show_figures('distribution', charts)
+            return
         
-        # Store all charts for export
-        self.current_figures = []
-        self.current_analysis_type = 'distribution'  # Mark analysis type
+        # Compute the chart data in the background from a snapshot, then draw on the main thread
+        data = self.data.copy(deep=False)
+        version = self.data_version
         
-        # 1. If total score exists, first show total score distribution
-        if "Total Score" in self.data.columns:
-            total_frame = ttk.LabelFrame(scrollable_frame, text="Total Score Distribution Analysis", padding="10")
-            total_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            fig_total, ax_total = plt.subplots(1, 1, figsize=(12, 6))
-            sns.histplot(self.data["Total Score"], bins=15, kde=True, ax=ax_total, color='green')
-            ax_total.set_title('Total Score Distribution Histogram', fontsize=14, fontweight='bold')
-            ax_total.set_xlabel('Total Score')
-            ax_total.set_ylabel('Student Count')
-            ax_total.grid(axis='y', linestyle='--', alpha=0.7)
-            
-            # Add statistical information
-            mean_score = self.data["Total Score"].mean()
-            max_score = self.data["Total Score"].max()
-            min_score = self.data["Total Score"].min()
-            ax_total.axvline(mean_score, color='red', linestyle='--', linewidth=2, label=f'Average: {mean_score:.1f}')
-            ax_total.legend()
-            
-            plt.tight_layout()
-            
-            canvas_total = FigureCanvasTkAgg(fig_total, master=total_frame)
-            canvas_total.draw()
-            canvas_total.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            self.current_figures.append(fig_total)
+        def on_done(prepared):
+            if version != self.data_version:
+                # Records were appended or corrected meanwhile: start over on the current data
+                self.perform_distribution_analysis()
+                return
+            charts = self.analysis_cache.put(key, version, self.build_distribution_figures(prepared))
+            self.show_figures('distribution', charts)
         
-        # 2. Create independent analysis charts for each subject
-        colors = sns.color_palette('Set2', n_colors=len(subject_columns))
+        self.task_runner.run(
+            "Grade distribution analysis",
+            lambda task: self.prepare_distribution_analysis(subject_columns, task, data=data),
+            on_done)
+    
+    @traced("distribution statistics")
+    def prepare_distribution_analysis(self, subject_columns, task=None, summary=None, data=None):
+        """Compute statistics, histograms, densities and score range percentages for the distribution charts
+        
+        Each column is binned once into a ScoreAggregate; its histogram feeds the
+        histogram, the KDE and the range pie chart. The scores come from data
+        (default self.data), or with summary (StreamingAggregates of an
+        out-of-core dataset) the existing aggregates are used.
+        """
+        task = task or BackgroundTask()
+        data = self.data if data is None else data
+        prepared = {"subject_columns": subject_columns, "total": None, "subjects": []}
+        if summary is not None:
+            total = summary.total if summary.total.count else None
+        else:
+            total = ScoreAggregate.of(data["Total Score"]) if "Total Score" in data.columns else None
+        if total is not None:
+            prepared["total"] = {"mean": total.mean(), **total.histogram_with_kde(15)}
         
         for i, subject in enumerate(subject_columns):
-            # Create independent frame for each subject
-            subject_frame = ttk.LabelFrame(scrollable_frame, text=f"{subject} Analysis", padding="10")
-            subject_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            # Create chart with two subplots: histogram and pie chart
-            fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-            
-            # Left: Score distribution histogram
-            sns.histplot(self.data[subject], bins=12, kde=True, ax=ax1, color=colors[i])
-            ax1.set_title(f'{subject} Score Distribution Histogram', fontsize=12, fontweight='bold')
-            ax1.set_xlabel('Score')
-            ax1.set_ylabel('Student Count')
-            ax1.grid(axis='y', linestyle='--', alpha=0.7)
+            task.progress(i / len(subject_columns), subject)
             
-            # Add statistical information to histogram
-            mean_score = self.data[subject].mean()
-            pass_score = 60 if self.data[subject].max() <= 100 else 90
-            ax1.axvline(mean_score, color='red', linestyle='--', linewidth=2, label=f'Average: {mean_score:.1f}')
-            ax1.axvline(pass_score, color='orange', linestyle='--', linewidth=2, label=f'Pass Line: {pass_score}')
-            ax1.legend()
+            aggregate = summary.subjects[subject] if summary is not None else ScoreAggregate.of(data[subject])
+            mean_score = aggregate.mean()
+            subject_max = aggregate.max
+            pass_score = 60 if subject_max <= 100 else 90
             
-            # Right: Score range percentage pie chart
-            subject_max = self.data[subject].max()
+            # Score range percentages for the pie chart
             if subject_max <= 100:
                 bins = [0, 60, 70, 80, 90, 100]
                 labels = ['Fail\n(0-59)', 'Pass\n(60-69)', 'Average\n(70-79)', 'Good\n(80-89)', 'Excellent\n(90-100)']
@@ -962,48 +3543,105 @@ class StudentGradeAnalysisSystem:
                 bins = [0, subject_max*0.6, subject_max*0.7, subject_max*0.8, subject_max*0.9, subject_max]
                 labels = ['Fail', 'Pass', 'Average', 'Good', 'Excellent']
             
-            score_ranges = pd.cut(self.data[subject], bins=bins, labels=labels, include_lowest=True)
-            range_counts = score_ranges.value_counts(normalize=True).reindex(labels) * 100
+            chart_data = aggregate.histogram_with_kde(12)
+            values, counts = chart_data["histogram"]
+            score_ranges = pd.cut(values, bins=bins, labels=labels, include_lowest=True)
+            range_counts = pd.Series(counts).groupby(score_ranges, observed=False).sum()
+            range_counts = range_counts.reindex(labels) / max(range_counts.sum(), 1) * 100
             
             # Filter out segments with 0%
-            non_zero_counts = range_counts[range_counts > 0]
-            non_zero_labels = non_zero_counts.index.tolist()
-            
-            # Use more attractive colors
-            pie_colors = sns.color_palette('viridis', n_colors=len(non_zero_labels))
-            
-            wedges, texts, autotexts = ax2.pie(non_zero_counts, labels=non_zero_labels, autopct='%1.1f%%', 
-                                             startangle=90, colors=pie_colors, explode=[0.05]*len(non_zero_labels))
-            
-            # Beautify pie chart text
-            for autotext in autotexts:
-                autotext.set_color('white')
-                autotext.set_fontweight('bold')
-                autotext.set_fontsize(10)
-            
-            ax2.set_title(f'{subject} Score Range Percentage', fontsize=12, fontweight='bold')
-            
-            plt.tight_layout()
+            prepared["subjects"].append({
+                "name": subject,
+                "mean": mean_score,
+                "pass_score": pass_score,
+                "range_counts": range_counts[range_counts > 0],
+                **chart_data
+            })
+        
+        return prepared
+    
+    @traced("build distribution charts")
+    def build_distribution_figures(self, prepared):
+        """Turn prepared chart data into the grade distribution LazyCharts"""
+        subject_columns = prepared["subject_columns"]
+        charts = []
+        
+        # 1. If total score exists, first show total score distribution
+        if prepared["total"] is not None:
+            total = prepared["total"]
             
-            # Embed chart in frame
-            canvas = FigureCanvasTkAgg(fig, master=subject_frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+            def draw_total():
+                fig_total, ax_total = plt.subplots(1, 1, figsize=(12, 6))
+                values, counts = total["histogram"]
+                sns.histplot(x=values, weights=counts, bins=15, ax=ax_total, color='green')
+                ax_total.plot(*total["kde"], color='green')
+                ax_total.set_title('Total Score Distribution Histogram', fontsize=14, fontweight='bold')
+                ax_total.set_xlabel('Total Score')
+                ax_total.set_ylabel('Student Count')
+                ax_total.grid(axis='y', linestyle='--', alpha=0.7)
+                
+                # Add statistical information
+                mean_score = total["mean"]
+                ax_total.axvline(mean_score, color='red', linestyle='--', linewidth=2, label=f'Average: {mean_score:.1f}')
+                ax_total.legend()
+                
+                plt.tight_layout()
+                
+                return fig_total
             
-            self.current_figures.append(fig)
+            charts.append(LazyChart("Total Score Distribution Analysis", (12, 6), draw_total))
         
-        # Bind mouse wheel event
-        def _on_mousewheel(event):
-            main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
-        
-        main_canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        # 2. Create independent analysis charts for each subject
+        colors = sns.color_palette('Set2', n_colors=len(subject_columns))
         
-        # Save first chart for export (for compatibility)
-        if self.current_figures:
-            self.current_fig = self.current_figures[0]
+        for i, subject_info in enumerate(prepared["subjects"]):
+            subject = subject_info["name"]
+            
+            def draw_subject(i=i, subject=subject, subject_info=subject_info):
+                # Create chart with two subplots: histogram and pie chart
+                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+                
+                # Left: Score distribution histogram
+                values, counts = subject_info["histogram"]
+                sns.histplot(x=values, weights=counts, bins=12, ax=ax1, color=colors[i])
+                ax1.plot(*subject_info["kde"], color=colors[i])
+                ax1.set_title(f'{subject} Score Distribution Histogram', fontsize=12, fontweight='bold')
+                ax1.set_xlabel('Score')
+                ax1.set_ylabel('Student Count')
+                ax1.grid(axis='y', linestyle='--', alpha=0.7)
+                
+                # Add statistical information to histogram
+                mean_score = subject_info["mean"]
+                pass_score = subject_info["pass_score"]
+                ax1.axvline(mean_score, color='red', linestyle='--', linewidth=2, label=f'Average: {mean_score:.1f}')
+                ax1.axvline(pass_score, color='orange', linestyle='--', linewidth=2, label=f'Pass Line: {pass_score}')
+                ax1.legend()
+                
+                # Right: Score range percentage pie chart
+                non_zero_counts = subject_info["range_counts"]
+                non_zero_labels = non_zero_counts.index.tolist()
+                
+                # Use more attractive colors
+                pie_colors = sns.color_palette('viridis', n_colors=len(non_zero_labels))
+                
+                wedges, texts, autotexts = ax2.pie(non_zero_counts, labels=non_zero_labels, autopct='%1.1f%%', 
+                                                 startangle=90, colors=pie_colors, explode=[0.05]*len(non_zero_labels))
+                
+                # Beautify pie chart text
+                for autotext in autotexts:
+                    autotext.set_color('white')
+                    autotext.set_fontweight('bold')
+                    autotext.set_fontsize(10)
+                
+                ax2.set_title(f'{subject} Score Range Percentage', fontsize=12, fontweight='bold')
+                
+                plt.tight_layout()
+                
+                return fig
+            
+            charts.append(LazyChart(f"{subject} Analysis", (14, 6), draw_subject))
         
-        # Switch to visualization tab
-        self.notebook.select(self.visual_frame)
+        return charts
     
     def export_analysis_results(self):
         """Export analysis results"""
@@ -1047,6 +3685,14 @@ class StudentGradeAnalysisSystem:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             default_filename = f"Grade_Analysis_Results_{timestamp}"
             
+            # The background task only reads this snapshot, taken here on the main thread
+            has_charts = var_chart.get() and bool(getattr(self, 'current_charts', None))
+            snapshot = self.analysis_snapshot(charts=has_charts, class_statistics=var_stats.get(), dpi=300)
+            
+            # Ask for every destination first; the files are written in the background
+            exports = []  # (description, function of the background task that writes the file(s))
+            messages = ["Analysis results exported successfully"]
+            
             if var_stats.get():
                 file_ext = ".xlsx" if var_format.get() == "excel" else ".csv"
                 file_path = filedialog.asksaveasfilename(
@@ -1060,36 +3706,14 @@ class StudentGradeAnalysisSystem:
                 )
                 
                 if file_path:
-                    try:
-                        # Create results table
-                        result_df = pd.DataFrame()
-                        
-                        # Add basic statistics
-                        stats_df = self.analysis_results["basic_stats"]
-                        
-                        # Add top 10 students by total score
-                        if "Total Score" in self.data.columns:
-                            top_students = self.data.sort_values("Total Score", ascending=False).head(10)
-                            result_df = pd.concat([result_df, pd.DataFrame(["", "Top 10 Students by Total Score", ""], columns=["Note"])])
-                            result_df = pd.concat([result_df, top_students[["Name", "Total Score", "Rank"]]])
-                        
-                        # Save to file
-                        if file_path.endswith('.csv'):
-                            result_df.to_csv(file_path, index=False)
-                        else:
-                            with pd.ExcelWriter(file_path) as writer:
-                                stats_df.to_excel(writer, sheet_name='Statistical Data')
-                                if "Total Score" in self.data.columns:
-                                    top_students.to_excel(writer, sheet_name='Top Students', index=False)
-                
-                    except Exception as e:
-                        messagebox.showerror("Error", f"Export statistical data failed: {str(e)}")
-                        return
+                    exports.append(("Export statistical data",
+                                    lambda task, path=file_path: self.write_statistics_file(path, snapshot)))
             
             # Export charts
-            if var_chart.get() and hasattr(self, 'current_figures'):
+            figures = snapshot["figures"]
+            if has_charts:
                 # If multiple charts, ask user if they want to export separately
-                if len(self.current_figures) > 1:
+                if len(figures) > 1:
                     export_choice = messagebox.askyesnocancel(
                         "Chart Export", 
                         "Multiple charts detected.\nClick 'Yes' to export each chart separately\nClick 'No' to export as single file\nClick 'Cancel' to skip chart export"
@@ -1100,47 +3724,20 @@ class StudentGradeAnalysisSystem:
                     elif export_choice:  # Export separately
                         base_path = filedialog.askdirectory(title="Select Save Directory")
                         if base_path:
-                            try:
-                                for i, fig in enumerate(self.current_figures):
-                                    if i == 0 and "Total Score" in self.data.columns:
-                                        filename = f"{default_filename}_Total_Score_Distribution.png"
-                                    elif hasattr(self, 'current_analysis_type'):
-                                        # Name based on analysis type
-                                        if self.current_analysis_type == 'subject':
-                                            if i == 0 or (i == 1 and "Total Score" not in self.data.columns):
-                                                filename = f"{default_filename}_Subject_Average_Comparison.png"
-                                            elif i == 1 or (i == 2 and "Total Score" in self.data.columns):
-                                                filename = f"{default_filename}_Subject_Score_Distribution_Box.png"
-                                            else:
-                                                filename = f"{default_filename}_Subject_Comparison_Chart{i+1}.png"
-                                        else:  # distribution analysis
-                                            # Get subject name
-                                            subject_columns = [col for col in self.data.columns 
-                                                             if col not in ["No.", "Student ID", "Name", "Class", "Total Score", "Rank"]]
-                                            subject_idx = i - (1 if "Total Score" in self.data.columns else 0)
-                                            if subject_idx < len(subject_columns):
-                                                subject_name = subject_columns[subject_idx]
-                                                filename = f"{default_filename}_{subject_name}_Analysis.png"
-                                            else:
-                                                filename = f"{default_filename}_Chart{i+1}.png"
-                                    else:
-                                        # Get subject name (compatibility handling)
-                                        subject_columns = [col for col in self.data.columns 
-                                                         if col not in ["No.", "Student ID", "Name", "Class", "Total Score", "Rank"]]
-                                        subject_idx = i - (1 if "Total Score" in self.data.columns else 0)
-                                        if subject_idx < len(subject_columns):
-                                            subject_name = subject_columns[subject_idx]
-                                            filename = f"{default_filename}_{subject_name}_Analysis.png"
-                                        else:
-                                            filename = f"{default_filename}_Chart{i+1}.png"
-                                    
-                                    file_path = os.path.join(base_path, filename)
-                                    fig.savefig(file_path, dpi=300, bbox_inches='tight')
-                                
-                                messagebox.showinfo("Success", f"Exported {len(self.current_figures)} charts to:\n{base_path}")
-                            except Exception as e:
-                                messagebox.showerror("Error", f"Chart export failed: {str(e)}")
-                                return
+                            # File names from analysis type and chart title (subject charts carry the subject name)
+                            names = chart_filenames(default_filename, getattr(self, 'current_analysis_type', 'analysis'),
+                                                    snapshot["titles"])
+                            paths = [os.path.join(base_path, name) for name in names]
+                            
+                            def export_charts(task, paths=paths, names=names):
+                                # Charts are rendered, encoded and written by a process pool when there are enough of them
+                                rasterize_figures(
+                                    figures, dpi=300, paths=paths,
+                                    progress=lambda done, total, index: task.progress(
+                                        done / total, f"chart {done}/{total}: {names[index]}"))
+                            
+                            exports.append(("Chart export", export_charts))
+                            messages.append(f"Exported {len(figures)} charts to:\n{base_path}")
                     else:  # Export as single file
                         file_path = filedialog.asksaveasfilename(
                             defaultextension=".png",
@@ -1154,21 +3751,8 @@ class StudentGradeAnalysisSystem:
                         )
                         
                         if file_path:
-                            try:
-                                # Combine all charts into one large figure
-                                from matplotlib.backends.backend_pdf import PdfPages
-                                
-                                if file_path.endswith('.pdf'):
-                                    with PdfPages(file_path) as pdf:
-                                        for fig in self.current_figures:
-                                            pdf.savefig(fig, bbox_inches='tight')
-                                else:
-                                    # For image formats, only save first chart
-                                    self.current_figures[0].savefig(file_path, dpi=300, bbox_inches='tight')
-                                    
-                            except Exception as e:
-                                messagebox.showerror("Error", f"Chart export failed: {str(e)}")
-                                return
+                            exports.append(("Chart export", lambda task, path=file_path:
+                                            self.save_figures(path, figures)))
                 else:
                     # Only one chart
                     file_path = filedialog.asksaveasfilename(
@@ -1183,47 +3767,145 @@ class StudentGradeAnalysisSystem:
                     )
                     
                     if file_path:
-                        try:
-                            self.current_figures[0].savefig(file_path, dpi=300, bbox_inches='tight')
-                        except Exception as e:
-                            messagebox.showerror("Error", f"Chart export failed: {str(e)}")
-                            return
-            elif var_chart.get() and hasattr(self, 'current_fig'):
-                # Compatibility for old version single chart export
-                file_path = filedialog.asksaveasfilename(
-                    defaultextension=".png",
-                    initialfile=default_filename,
-                    filetypes=[
-                        ("PNG files", "*.png"),
-                        ("JPEG files", "*.jpg"),
-                        ("PDF files", "*.pdf"),
-                        ("All files", "*.*")
-                    ]
-                )
-                
-                if file_path:
+                        exports.append(("Chart export", lambda task, path=file_path:
+                                        self.save_figures(path, figures[:1])))
+            
+            def job(task):
+                for i, (label, write) in enumerate(exports):
+                    task.progress(i / len(exports), f"{i + 1}/{len(exports)}")
                     try:
-                        self.current_fig.savefig(file_path, dpi=300, bbox_inches='tight')
+                        with TRACER.span(label):
+                            write(task)
                     except Exception as e:
-                        messagebox.showerror("Error", f"Chart export failed: {str(e)}")
-                        return
+                        raise RuntimeError(f"{label} failed: {str(e)}") from e
+            
+            export_window.destroy()
+            self.task_runner.run("Export", job, lambda result: messagebox.showinfo("Success", "\n\n".join(messages)))
+        
+        ttk.Button(export_window, text="Export", command=do_export).pack(pady=20)
+    
+    @traced("write statistics file")
+    def write_statistics_file(self, file_path, snapshot=None):
+        """Write statistics and top students to an Excel or CSV file (from an analysis_snapshot, default now)"""
+        snapshot = snapshot or self.analysis_snapshot(charts=False, class_statistics=True)
+        data = snapshot["data"]
+        
+        # Create results table
+        result_df = pd.DataFrame()
+        
+        # Add basic statistics
+        stats_df = snapshot["results"]["basic_stats"]
+        
+        # Add top 10 students by total score
+        if "Total Score" in data.columns:
+            top_students = data.sort_values("Total Score", ascending=False).head(10)
+            result_df = pd.concat([result_df, pd.DataFrame(["", "Top 10 Students by Total Score", ""], columns=["Note"])])
+            result_df = pd.concat([result_df, top_students[["Name", "Total Score", "Rank"]]])
+        
+        # Save to file
+        if file_path.endswith('.csv'):
+            result_df.to_csv(file_path, index=False)
+        else:
+            with pd.ExcelWriter(file_path) as writer:
+                stats_df.to_excel(writer, sheet_name='Statistical Data')
+                if "Total Score" in data.columns:
+                    top_students.to_excel(writer, sheet_name='Top Students', index=False)
+                if "class_statistics" in snapshot:
+                    snapshot["class_statistics"].to_excel(writer, sheet_name='Class Statistics')
+    
+    def save_figures(self, file_path, figures):
+        """Save several charts (Figures or snapshot_figures entries) to one file (all pages for PDF, first chart for image formats)"""
+        # Combine all charts into one large figure
+        from matplotlib.backends.backend_pdf import PdfPages
+        
+        if file_path.endswith('.pdf'):
+            with PdfPages(file_path) as pdf:
+                for fig in figures:
+                    pdf.savefig(load_figure(fig), bbox_inches='tight')
+        else:
+            # For image formats, only save first chart
+            load_figure(figures[0]).savefig(file_path, dpi=300, bbox_inches='tight')
+    
+    def generate_pdf_report(self):
+        """Generate PDF report"""
+        if self.data is None or self.analysis_results is None:
+            messagebox.showwarning("Warning", "Please perform analysis first")
+            return
+
+        # Get save path
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf"), ("All files", "*")]
+        )
+
+        if not file_path:
+            return
+
+        # The job only reads this snapshot; charts not scrolled into view yet are drawn here, on the main thread
+        snapshot = self.analysis_snapshot()
+
+        self.task_runner.run(
+            "PDF report generation",
+            lambda task: self.write_pdf_report(file_path, task, snapshot=snapshot),
+            lambda result: messagebox.showinfo("Success", "PDF report generated successfully"))
+    
+    def generate_report_cards(self):
+        """Generate a report card for every student (one merged PDF or one file per student)"""
+        if self.data is None:
+            messagebox.showwarning("Warning", "Please import data first")
+            return
+        
+        per_student = messagebox.askyesnocancel(
+            "Report Cards",
+            "Click 'Yes' to write one PDF file per student\nClick 'No' to write one merged PDF\nClick 'Cancel' to abort"
+        )
+        if per_student is None:
+            return
+        
+        if per_student:
+            output = filedialog.askdirectory(title="Select Save Directory")
+        else:
+            output = filedialog.asksaveasfilename(
+                defaultextension=".pdf",
+                initialfile="Report_Cards",
+                filetypes=[("PDF files", "*.pdf"), ("All files", "*")]
+            )
+        if not output:
+            return
         
-            messagebox.showinfo("Success", "Analysis results exported successfully")
-            export_window.destroy()
+        # Snapshot (copy-on-write) of the data the cards are written from
+        data = self.data.copy(deep=False)
+        subject_columns = self.get_subject_columns()
+        
+        def job(task):
+            task.progress(None, "cohort statistics")
+            cards = ReportCards(data, subject_columns)
+            return cards.write(output, per_student,
+                               progress=lambda done, total: task.progress(done / total, f"{done}/{total} cards"))
+        
+        self.task_runner.run(
+            "Report card generation", job,
+            lambda paths: messagebox.showinfo("Success", f"Wrote report cards for {len(data)} students to:\n{output}"))
     
-    def generate_pdf_report(self):
-        """Generate PDF report"""
-        if self.data is None or self.analysis_results is None:
-            messagebox.showwarning("Warning", "Please perform analysis first")
-            return
-
+    @traced("write PDF report")
+    def write_pdf_report(self, file_path, task=None, chart_workers=None, snapshot=None):
+        """Write the PDF report (statistics, charts and conclusions) to file_path
+        
+        Everything comes from snapshot (an analysis_snapshot, taken now by
+        default). chart_workers limits the processes that rasterize the
+        charts (default one per core).
+        """
+        task = task or BackgroundTask()
+        snapshot = snapshot or self.analysis_snapshot(detach_figures=False)
+        data = snapshot["data"]
+        
         from reportlab.pdfbase import pdfmetrics
         from reportlab.pdfbase.ttfonts import TTFont
         from reportlab.lib.pagesizes import letter
         from reportlab.pdfgen import canvas
+        from reportlab.lib.utils import ImageReader
         from matplotlib.backends.backend_agg import FigureCanvasAgg
-        import os
-        import tempfile
+        import io
         import matplotlib.font_manager as fm
 
         # Font setup helper function
@@ -1231,179 +3913,133 @@ class StudentGradeAnalysisSystem:
             """Set PDF font"""
             pdf.setFont("Helvetica-Bold", size) if bold else pdf.setFont("Helvetica", size)
 
-        # Get save path
-        file_path = filedialog.asksaveasfilename(
-            defaultextension=".pdf",
-            filetypes=[("PDF files", "*.pdf"), ("All files", "*")]
-        )
+        stats = snapshot["results"]["statistics"]
 
-        if not file_path:
-            return
+        # Create PDF canvas
+        pdf = canvas.Canvas(file_path, pagesize=letter)
+        width, height = letter
 
-        try:
-            # Create PDF canvas
-            pdf = canvas.Canvas(file_path, pagesize=letter)
-            width, height = letter
-
-            # Add title
-            set_pdf_font(pdf, 16, bold=True)
-            pdf.drawString(30, height - 30, "Student Grade Analysis Report")
-
-            # Add statistical data
-            y_position = height - 60
-            set_pdf_font(pdf, 12)
-            pdf.drawString(30, y_position, "===== Basic Statistical Information =====")
+        # Add title
+        set_pdf_font(pdf, 16, bold=True)
+        pdf.drawString(30, height - 30, "Student Grade Analysis Report")
+
+        # Add statistical data
+        y_position = height - 60
+        set_pdf_font(pdf, 12)
+        pdf.drawString(30, y_position, "===== Basic Statistical Information =====")
+        y_position -= 20
+        pdf.drawString(30, y_position, f"Total Records: {stats.records}")
+
+        if stats.student_count is not None:
             y_position -= 20
-            pdf.drawString(30, y_position, f"Total Records: {len(self.data)}")
+            pdf.drawString(30, y_position, f"Student Count: {stats.student_count}")
 
-            if "Name" in self.data.columns:
-                y_position -= 20
-                pdf.drawString(30, y_position, f"Student Count: {self.data['Name'].nunique()}")
+        y_position -= 40
+        pdf.drawString(30, y_position, "===== Detailed Subject Statistics =====")
+        y_position -= 20
+
+        for subject, row in stats.table.iterrows():
+            if y_position < 50:
+                pdf.showPage()
+                y_position = height - 30
+
+            pdf.drawString(30, y_position, f"{subject}:")
+            y_position -= 20
+            pdf.drawString(50, y_position, f"Average Score: {row['mean']:.2f}")
+            y_position -= 20
+            pdf.drawString(50, y_position, f"Median: {row['50%']:.2f}")
+            y_position -= 20
+            pdf.drawString(50, y_position, f"Standard Deviation: {row['std']:.2f}")
+            y_position -= 20
 
-            y_position -= 40
-            pdf.drawString(30, y_position, "===== Detailed Subject Statistics =====")
+        # Add more statistical content
+        if stats.total is not None and "Total Score" in data.columns:
             y_position -= 20
+            pdf.drawString(30, y_position, "===== Total Score Statistics =====")
+            y_position -= 20
+            pdf.drawString(50, y_position, f"Average Score: {stats.total['mean']:.2f}")
+            y_position -= 20
+            pdf.drawString(50, y_position, f"Highest Score: {stats.total['max']:g}")
+            y_position -= 20
+            pdf.drawString(50, y_position, f"Lowest Score: {stats.total['min']:g}")
+            y_position -= 20
+            pdf.drawString(50, y_position, f"Standard Deviation: {stats.total['std']:.2f}")
+            y_position -= 30
 
-            for subject in self.analysis_results["subject_columns"]:
+            # Add top 10 students
+            pdf.drawString(30, y_position, "===== Top 10 Students by Score =====")
+            y_position -= 20
+            top_students = data.sort_values("Total Score", ascending=False).head(10)
+            for idx, (_, student) in enumerate(top_students.iterrows()):
                 if y_position < 50:
                     pdf.showPage()
                     y_position = height - 30
+                    set_pdf_font(pdf, 12)  # Reset font
 
-                pdf.drawString(30, y_position, f"{subject}:")
-                y_position -= 20
-                pdf.drawString(50, y_position, f"Average Score: {self.data[subject].mean():.2f}")
-                y_position -= 20
-                pdf.drawString(50, y_position, f"Median: {self.data[subject].median():.2f}")
-                y_position -= 20
-                pdf.drawString(50, y_position, f"Standard Deviation: {self.data[subject].std():.2f}")
-                y_position -= 20
+                student_name = student['Name']
+                total_score = student['Total Score']
+                student_info = f"{idx+1}. {student_name}: {total_score}"
+                pdf.drawString(50, y_position, student_info)
 
-            # Add more statistical content
-            if "Total Score" in self.data.columns:
-                y_position -= 20
-                pdf.drawString(30, y_position, "===== Total Score Statistics =====")
-                y_position -= 20
-                pdf.drawString(50, y_position, f"Average Score: {self.data['Total Score'].mean():.2f}")
                 y_position -= 20
-                pdf.drawString(50, y_position, f"Highest Score: {self.data['Total Score'].max()}")
-                y_position -= 20
-                pdf.drawString(50, y_position, f"Lowest Score: {self.data['Total Score'].min()}")
-                y_position -= 20
-                pdf.drawString(50, y_position, f"Standard Deviation: {self.data['Total Score'].std():.2f}")
+
+        # Add all charts, titled from the LazyChart they were drawn from
+        if snapshot["figures"]:
+            # Rasterize every chart up front (in parallel when it pays off), without temporary files
+            with TRACER.span("rasterize charts", charts=len(snapshot["figures"])):
+                images = rasterize_figures(
+                    snapshot["figures"], dpi=150, workers=chart_workers,
+                    progress=lambda done, total, index: task.progress(done / total, f"chart {done}/{total}"))
+            for i, title in enumerate(snapshot["titles"]):
+                # Check if new page needed
+                if y_position < 350:
+                    pdf.showPage()
+                    y_position = height - 30
+
+                # Add chart title
+                set_pdf_font(pdf, 14, bold=True)
+                pdf.drawString(30, y_position, title)
                 y_position -= 30
-                
-                # Add top 10 students
-                pdf.drawString(30, y_position, "===== Top 10 Students by Score =====")
-                y_position -= 20
-                top_students = self.data.sort_values("Total Score", ascending=False).head(10)
-                for idx, (_, student) in enumerate(top_students.iterrows()):
-                    if y_position < 50:
-                        pdf.showPage()
-                        y_position = height - 30
-                        set_pdf_font(pdf, 12)  # Reset font
-                    
-                    student_name = student['Name']
-                    total_score = student['Total Score']
-                    student_info = f"{idx+1}. {student_name}: {total_score}"
-                    pdf.drawString(50, y_position, student_info)
-                    
-                    y_position -= 20
-
-            # Add all charts
-            if hasattr(self, 'current_figures'):
-                for i, fig in enumerate(self.current_figures):
-                    # Check if new page needed
-                    if y_position < 350:
-                        pdf.showPage()
-                        y_position = height - 30
-
-                    # Add chart title
-                    set_pdf_font(pdf, 14, bold=True)
-                    if i == 0 and "Total Score" in self.data.columns:
-                        chart_title = "Total Score Distribution Analysis Chart"
-                    elif hasattr(self, 'current_analysis_type'):
-                        if self.current_analysis_type == 'subject':
-                            if i == 0 or (i == 1 and "Total Score" not in self.data.columns):
-                                chart_title = "Subject Average Comparison Chart"
-                            elif i == 1 or (i == 2 and "Total Score" in self.data.columns):
-                                chart_title = "Subject Score Distribution Box Plot"
-                            else:
-                                chart_title = f"Subject Comparison Chart {i+1}"
-                        else:  # distribution analysis
-                            subject_columns = [col for col in self.data.columns 
-                                             if col not in ["No.", "Student ID", "Name", "Class", "Total Score", "Rank"]]
-                            subject_idx = i - (1 if "Total Score" in self.data.columns else 0)
-                            if subject_idx < len(subject_columns):
-                                subject_name = subject_columns[subject_idx]
-                                chart_title = f"{subject_name} Analysis Chart"
-                            else:
-                                chart_title = f"Analysis Chart {i+1}"
-                    else:
-                        chart_title = f"Analysis Chart {i+1}"
-                    
-                    pdf.drawString(30, y_position, chart_title)
-                    y_position -= 30
 
-                    # Save chart as image (using unique filename)
-                    import tempfile
-                    import os
-                    
-                    # Create temporary file
-                    temp_file = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-                    temp_file.close()
-                    img_path = temp_file.name
-                    
-                    try:
-                        # Save chart
-                        fig.savefig(img_path, format="png", dpi=150, bbox_inches='tight')
+                # Insert the in-memory image into PDF
+                pdf.drawImage(ImageReader(io.BytesIO(images[i])), 30, y_position - 280, width=500, height=280)
+                y_position -= 320
 
-                        # Insert image into PDF
-                        pdf.drawImage(img_path, 30, y_position - 280, width=500, height=280)
-                        y_position -= 320
-                        
-                    finally:
-                        # Clean up temporary file
-                        if os.path.exists(img_path):
-                            os.unlink(img_path)
+        # Add analysis conclusions
+        if y_position < 150:
+            pdf.showPage()
+            y_position = height - 30
 
-            # Add analysis conclusions
-            if y_position < 150:
-                pdf.showPage()
-                y_position = height - 30
-            
-            set_pdf_font(pdf, 14, bold=True)
-            pdf.drawString(30, y_position, "===== Analysis Conclusions =====")
-            y_position -= 30
-            set_pdf_font(pdf, 12)
-            
-            # Calculate overall performance
-            subject_columns = self.analysis_results["subject_columns"]
-            overall_avg = sum(self.data[subject].mean() for subject in subject_columns) / len(subject_columns)
-            pdf.drawString(50, y_position, f"1. Overall subject average: {overall_avg:.2f}")
-            y_position -= 20
-            
-            # Find best and worst performing subjects
-            best_subject = max(subject_columns, key=lambda x: self.data[x].mean())
-            worst_subject = min(subject_columns, key=lambda x: self.data[x].mean())
-            pdf.drawString(50, y_position, f"2. Best performing subject: {best_subject} ({self.data[best_subject].mean():.2f})")
-            y_position -= 20
-            pdf.drawString(50, y_position, f"3. Subject needing improvement: {worst_subject} ({self.data[worst_subject].mean():.2f})")
-            y_position -= 20
-            
-            # Overall pass rate
-            overall_pass_rate = sum((self.data[subject] >= 60).sum() for subject in subject_columns) / (len(subject_columns) * len(self.data)) * 100
-            pdf.drawString(50, y_position, f"4. Overall pass rate: {overall_pass_rate:.2f}%")
-            y_position -= 30
-            
-            # Add generation time
-            from datetime import datetime
-            pdf.drawString(50, y_position, f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        set_pdf_font(pdf, 14, bold=True)
+        pdf.drawString(30, y_position, "===== Analysis Conclusions =====")
+        y_position -= 30
+        set_pdf_font(pdf, 12)
 
-            pdf.save()
-            messagebox.showinfo("Success", "PDF report generated successfully")
+        # Calculate overall performance
+        means = stats.table["mean"]
+        overall_avg = means.mean()
+        pdf.drawString(50, y_position, f"1. Overall subject average: {overall_avg:.2f}")
+        y_position -= 20
 
-        except Exception as e:
-            messagebox.showerror("Error", f"PDF report generation failed: {str(e)}")
+        # Find best and worst performing subjects
+        best_subject = means.idxmax()
+        worst_subject = means.idxmin()
+        pdf.drawString(50, y_position, f"2. Best performing subject: {best_subject} ({means[best_subject]:.2f})")
+        y_position -= 20
+        pdf.drawString(50, y_position, f"3. Subject needing improvement: {worst_subject} ({means[worst_subject]:.2f})")
+        y_position -= 20
+
+        # Overall pass rate
+        overall_pass_rate = stats.table["pass_rate"].mean()
+        pdf.drawString(50, y_position, f"4. Overall pass rate: {overall_pass_rate:.2f}%")
+        y_position -= 30
+
+        # Add generation time
+        from datetime import datetime
+        pdf.drawString(50, y_position, f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+
+        with TRACER.span("save PDF"):
+            pdf.save()
     
     def show_about(self):
         """Show about information"""
@@ -1437,6 +4073,12 @@ Simple Student Grade Analysis System User Guide
    - Click "File" -> "Import Data" in menu bar
    - Supports Excel(.xlsx, .xls) and CSV(.csv) format files
    - Data should contain student information (name, student ID, etc.) and subject grades
+   - For very large files use "File" -> "Import Large File (Streaming)": the file is read in chunks
+     and only running statistics are kept, so "Basic Statistical Analysis" works without loading the full table
+   - "File" -> "Import Larger-than-Memory File (Memory-Mapped)" stores the scores in an on-disk matrix that
+     basic, subject and distribution analyses read block by block
+   - "File" -> "Append Records" adds the records of another file (e.g. late exam results) to the loaded data;
+     the statistics are updated incrementally instead of being recomputed
 
 2. Data Generation
    - Click "Tools" -> "Student Data Generator" in menu bar
@@ -1466,209 +4108,704 @@ Simple Student Grade Analysis System User Guide
         help_text.insert(tk.END, help_content)
         help_text.config(state=tk.DISABLED)
     
+    @traced("perform_advanced_analysis")
     def perform_advanced_analysis(self):
         """Perform advanced analysis"""
+        if self.out_of_core():
+            messagebox.showwarning("Warning", "Advanced analysis needs the full table, please use Import Data")
+            return
+        
         if self.data is None:
             messagebox.showwarning("Warning", "Please import data first")
             return
-            
-        # Clear visualization panel
-        for widget in self.visual_frame.winfo_children():
-            widget.destroy()
         
         # Identify subject columns
-        subject_columns = []
-        for col in self.data.columns:
-            if col not in ["No.", "Student ID", "Name", "Class", "Total Score", "Rank"]:
-                subject_columns.append(col)
-        
-        if not subject_columns:
-            messagebox.showwarning("Warning", "No subject columns identified")
-            return
-        
-        # Create a main frame to hold all charts
-        main_canvas = tk.Canvas(self.visual_frame)
-        scrollbar_v = ttk.Scrollbar(self.visual_frame, orient="vertical", command=main_canvas.yview)
-        scrollbar_h = ttk.Scrollbar(self.visual_frame, orient="horizontal", command=main_canvas.xview)
-        scrollable_frame = ttk.Frame(main_canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all"))
-        )
-
-        main_canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        main_canvas.configure(yscrollcommand=scrollbar_v.set, xscrollcommand=scrollbar_h.set)
-
-        # Position horizontal scrollbar at bottom of visualization interface
-        main_canvas.pack(side="top", fill="both", expand=True)
-        scrollbar_h.pack(side=tk.BOTTOM, fill=tk.X)
-        scrollbar_v.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        # Store all charts for export
-        self.current_figures = []
-        self.current_analysis_type = 'advanced'  # Mark analysis type
+        subject_columns = self.get_subject_columns()
+        self.show_cached_figures('advanced', subject_columns, lambda: self.build_advanced_figures(subject_columns))
+    
+    @traced("build advanced charts")
+    def build_advanced_figures(self, subject_columns):
+        """Build the advanced analysis charts as LazyCharts"""
+        # Snapshot (copy-on-write) of the data the charts are drawn from
+        data = self.data.copy(deep=False)
+        version = self.data_version
+        charts = []
         
         # 1. Subject correlation heatmap
-        corr_frame = ttk.LabelFrame(scrollable_frame, text="Subject Correlation Analysis", padding="10")
-        corr_frame.pack(fill=tk.X, padx=10, pady=5)
+        # Pearson matrix from the running cross-product sums (no pass over the data once they exist)
+        correlation_matrix = self.get_correlation(subject_columns)
         
-        fig1, ax1 = plt.subplots(1, 1, figsize=(12, 8))
-        
-        # Calculate correlation matrix
-        correlation_matrix = self.data[subject_columns].corr()
+        def draw_correlation():
+            fig1, ax1 = plt.subplots(1, 1, figsize=(12, 8))
+            
+            # Create heatmap
+            sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0,
+                       square=True, ax=ax1, fmt='.2f', cbar_kws={'shrink': .8})
+            ax1.set_title('Subject Correlation Heatmap', fontsize=14, fontweight='bold')
+            plt.tight_layout()
+            
+            return fig1
         
-        # Create heatmap
-        sns.heatmap(correlation_matrix, annot=True, cmap='coolwarm', center=0,
-                   square=True, ax=ax1, fmt='.2f', cbar_kws={'shrink': .8})
-        ax1.set_title('Subject Correlation Heatmap', fontsize=14, fontweight='bold')
-        plt.tight_layout()
+        charts.append(LazyChart("Subject Correlation Analysis", (12, 8), draw_correlation))
         
-        canvas1 = FigureCanvasTkAgg(fig1, master=corr_frame)
-        canvas1.draw()
-        canvas1.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        # Rank (Spearman) correlation, computed when the chart is first shown
+        def draw_rank_correlation():
+            fig, ax = plt.subplots(1, 1, figsize=(12, 8))
+            
+            rank_matrix = self.get_correlation(subject_columns, "spearman", data, version)
+            sns.heatmap(rank_matrix, annot=True, cmap='coolwarm', center=0,
+                       square=True, ax=ax, fmt='.2f', cbar_kws={'shrink': .8})
+            ax.set_title('Subject Rank (Spearman) Correlation Heatmap', fontsize=14, fontweight='bold')
+            plt.tight_layout()
+            
+            return fig
         
-        self.current_figures.append(fig1)
+        charts.append(LazyChart("Subject Rank Correlation Analysis", (12, 8), draw_rank_correlation))
         
         # 2. Class grade comparison analysis (if class information exists)
-        if "Class" in self.data.columns:
-            class_frame = ttk.LabelFrame(scrollable_frame, text="Class Grade Comparison Analysis", padding="10")
-            class_frame.pack(fill=tk.X, padx=10, pady=5)
+        if "Class" in data.columns:
+            def draw_class_comparison():
+                fig2, ax2 = plt.subplots(1, 1, figsize=(12, 6))
+                
+                # Calculate average scores for each class
+                class_avg = self.get_class_statistics(subject_columns, data, version)["mean"].droplevel("Grade")
+                
+                # Create stacked bar chart
+                class_avg.plot(kind='bar', ax=ax2, width=0.8)
+                ax2.set_title('Average Score Comparison by Class and Subject', fontsize=14, fontweight='bold')
+                ax2.set_ylabel('Average Score')
+                ax2.set_xlabel('Class')
+                ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+                plt.xticks(rotation=45)
+                plt.tight_layout()
+                
+                return fig2
             
-            fig2, ax2 = plt.subplots(1, 1, figsize=(12, 6))
+            charts.append(LazyChart("Class Grade Comparison Analysis", (12, 6), draw_class_comparison))
+        
+        # 3. Grade distribution density plot
+        def draw_density():
+            fig3, ax3 = plt.subplots(1, 1, figsize=(12, 6))
             
-            # Calculate average scores for each class
-            class_avg = self.data.groupby("Class")[subject_columns].mean()
+            # Draw density curve for each subject (binned FFT KDE, like kdeplot's default cut=3)
+            colors = plt.cm.Set3(range(len(subject_columns)))
+            for i, subject in enumerate(subject_columns):
+                grid, density = ScoreAggregate.of(data[subject]).kde(cut=3)
+                ax3.plot(grid, density, color=colors[i], label=subject)
             
-            # Create stacked bar chart
-            class_avg.plot(kind='bar', ax=ax2, width=0.8)
-            ax2.set_title('Average Score Comparison by Class and Subject', fontsize=14, fontweight='bold')
-            ax2.set_ylabel('Average Score')
-            ax2.set_xlabel('Class')
-            ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-            plt.xticks(rotation=45)
+            ax3.set_title('Grade Distribution Density Plot by Subject', fontsize=14, fontweight='bold')
+            ax3.set_xlabel('Score')
+            ax3.set_ylabel('Density')
+            ax3.legend()
+            ax3.grid(True, alpha=0.3)
             plt.tight_layout()
             
-            canvas2 = FigureCanvasTkAgg(fig2, master=class_frame)
-            canvas2.draw()
-            canvas2.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            
-            self.current_figures.append(fig2)
-        
-        # 3. Grade distribution density plot
-        density_frame = ttk.LabelFrame(scrollable_frame, text="Grade Distribution Density Analysis", padding="10")
-        density_frame.pack(fill=tk.X, padx=10, pady=5)
-        
-        fig3, ax3 = plt.subplots(1, 1, figsize=(12, 6))
-        
-        # Draw density curve for each subject
-        colors = plt.cm.Set3(range(len(subject_columns)))
-        for i, subject in enumerate(subject_columns):
-            sns.kdeplot(data=self.data, x=subject, ax=ax3, color=colors[i], label=subject)
-        
-        ax3.set_title('Grade Distribution Density Plot by Subject', fontsize=14, fontweight='bold')
-        ax3.set_xlabel('Score')
-        ax3.set_ylabel('Density')
-        ax3.legend()
-        ax3.grid(True, alpha=0.3)
-        plt.tight_layout()
+            return fig3
         
-        canvas3 = FigureCanvasTkAgg(fig3, master=density_frame)
-        canvas3.draw()
-        canvas3.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        
-        self.current_figures.append(fig3)
+        charts.append(LazyChart("Grade Distribution Density Analysis", (12, 6), draw_density))
         
         # 4. Student grade radar chart (top 5 students)
-        if "Total Score" in self.data.columns:
-            radar_frame = ttk.LabelFrame(scrollable_frame, text="Top Students Grade Radar Chart", padding="10")
-            radar_frame.pack(fill=tk.X, padx=10, pady=5)
-            
-            fig4, ax4 = plt.subplots(1, 1, figsize=(10, 10), subplot_kw=dict(projection='polar'))
-            
-            # Get top 5 students
-            top5_students = self.data.nlargest(5, "Total Score")
-            
-            # Set radar chart angles
-            angles = np.linspace(0, 2 * np.pi, len(subject_columns), endpoint=False)
-            angles = np.concatenate((angles, [angles[0]]))  # Close the shape
-            
-            colors_radar = plt.cm.Set1(range(5))
-            
-            for i, (_, student) in enumerate(top5_students.iterrows()):
-                values = [student[subject] for subject in subject_columns]
-                values += [values[0]]  # Close the shape
+        if "Total Score" in data.columns:
+            def draw_radar():
+                fig4, ax4 = plt.subplots(1, 1, figsize=(10, 10), subplot_kw=dict(projection='polar'))
                 
-                ax4.plot(angles, values, 'o-', linewidth=2, label=f"{student['Name']}", color=colors_radar[i])
-                ax4.fill(angles, values, alpha=0.1, color=colors_radar[i])
-            
-            ax4.set_xticks(angles[:-1])
-            ax4.set_xticklabels(subject_columns)
-            ax4.set_title('Top 5 Students Grade Radar Chart', fontsize=14, fontweight='bold', pad=20)
-            ax4.legend(loc='upper right', bbox_to_anchor=(1.2, 1.0))
-            plt.tight_layout()
-            
-            canvas4 = FigureCanvasTkAgg(fig4, master=radar_frame)
-            canvas4.draw()
-            canvas4.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+                # Get top 5 students
+                top5_students = data.nlargest(5, "Total Score")
+                
+                # Set radar chart angles
+                angles = np.linspace(0, 2 * np.pi, len(subject_columns), endpoint=False)
+                angles = np.concatenate((angles, [angles[0]]))  # Close the shape
+                
+                colors_radar = plt.cm.Set1(range(5))
+                
+                for i, (_, student) in enumerate(top5_students.iterrows()):
+                    values = [student[subject] for subject in subject_columns]
+                    values += [values[0]]  # Close the shape
+                    
+                    ax4.plot(angles, values, 'o-', linewidth=2, label=f"{student['Name']}", color=colors_radar[i])
+                    ax4.fill(angles, values, alpha=0.1, color=colors_radar[i])
+                
+                ax4.set_xticks(angles[:-1])
+                ax4.set_xticklabels(subject_columns)
+                ax4.set_title('Top 5 Students Grade Radar Chart', fontsize=14, fontweight='bold', pad=20)
+                ax4.legend(loc='upper right', bbox_to_anchor=(1.2, 1.0))
+                plt.tight_layout()
+                
+                return fig4
             
-            self.current_figures.append(fig4)
+            charts.append(LazyChart("Top Students Grade Radar Chart", (10, 10), draw_radar))
         
         # 5. Grade trend analysis (scatter plot matrix)
-        scatter_frame = ttk.LabelFrame(scrollable_frame, text="Subject Grade Scatter Plot Matrix", padding="10")
-        scatter_frame.pack(fill=tk.X, padx=10, pady=5)
-        
         # Select main subjects for scatter plot analysis (avoid overly complex chart)
         main_subjects = subject_columns[:4] if len(subject_columns) > 4 else subject_columns
         
         if len(main_subjects) > 1:
-            fig5, axes = plt.subplots(len(main_subjects), len(main_subjects), figsize=(12, 12))
+            # Trend lines come from sufficient statistics of the complete rows: sums and one
+            # matrix product of cross-products give every pair's least-squares fit
+            scores = data[main_subjects].to_numpy(dtype=float)
+            scores = scores[~np.isnan(scores).any(axis=1)]
+            count = max(len(scores), 1)
+            sums = scores.sum(axis=0)
+            covariance = scores.T @ scores - np.outer(sums, sums) / count
+            means = sums / count
+            density_mode = len(scores) > SCATTER_DENSITY_THRESHOLD
+            if density_mode:
+                from matplotlib.colors import LogNorm
             
-            for i, subject1 in enumerate(main_subjects):
-                for j, subject2 in enumerate(main_subjects):
-                    ax = axes[i, j] if len(main_subjects) > 1 else axes
-                    
-                    if i == j:
-                        # Diagonal shows histogram
-                        ax.hist(self.data[subject1], bins=15, alpha=0.7, color='skyblue')
-                        ax.set_title(f'{subject1} Distribution')
-                    else:
-                        # Off-diagonal shows scatter plot
-                        ax.scatter(self.data[subject2], self.data[subject1], alpha=0.6, s=20)
+            def draw_scatter_matrix():
+                fig5, axes = plt.subplots(len(main_subjects), len(main_subjects), figsize=(12, 12))
+                
+                for i, subject1 in enumerate(main_subjects):
+                    for j, subject2 in enumerate(main_subjects):
+                        ax = axes[i, j] if len(main_subjects) > 1 else axes
                         
-                        # Add trend line
-                        z = np.polyfit(self.data[subject2], self.data[subject1], 1)
-                        p = np.poly1d(z)
-                        ax.plot(self.data[subject2], p(self.data[subject2]), "r--", alpha=0.8)
-                    
-                    if j == 0:
-                        ax.set_ylabel(subject1)
-                    if i == len(main_subjects) - 1:
-                        ax.set_xlabel(subject2)
-            
-            plt.suptitle('Main Subject Grade Relationship Scatter Plot Matrix', fontsize=14, fontweight='bold')
-            plt.tight_layout()
-            
-            canvas5 = FigureCanvasTkAgg(fig5, master=scatter_frame)
-            canvas5.draw()
-            canvas5.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+                        if i == j:
+                            # Diagonal shows histogram
+                            if density_mode:
+                                values, counts = ScoreAggregate.of(data[subject1]).occupied()
+                                ax.hist(values, bins=15, weights=counts, alpha=0.7, color='skyblue')
+                            else:
+                                ax.hist(data[subject1], bins=15, alpha=0.7, color='skyblue')
+                            ax.set_title(f'{subject1} Distribution')
+                        else:
+                            if density_mode:
+                                # Large data: log-scaled counts per score pair instead of one marker per student
+                                x_edges, y_edges, counts = binned_counts_2d(scores[:, j], scores[:, i])
+                                ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0),
+                                              cmap='Blues', norm=LogNorm())
+                            else:
+                                # Off-diagonal shows scatter plot
+                                ax.scatter(data[subject2], data[subject1], alpha=0.6, s=20)
+                            
+                            # Add trend line
+                            if len(scores) > 1 and covariance[j, j] > 0:
+                                slope = covariance[i, j] / covariance[j, j]
+                                line_x = np.array([scores[:, j].min(), scores[:, j].max()])
+                                ax.plot(line_x, means[i] + slope * (line_x - means[j]), "r--", alpha=0.8)
+                        
+                        if j == 0:
+                            ax.set_ylabel(subject1)
+                        if i == len(main_subjects) - 1:
+                            ax.set_xlabel(subject2)
+                
+                plt.suptitle('Main Subject Grade Relationship Scatter Plot Matrix', fontsize=14, fontweight='bold')
+                plt.tight_layout()
+                
+                return fig5
             
-            self.current_figures.append(fig5)
+            charts.append(LazyChart("Subject Grade Scatter Plot Matrix", (12, 12), draw_scatter_matrix))
         
-        # Bind mouse wheel event
-        def _on_mousewheel(event):
-            main_canvas.yview_scroll(int(-1*(event.delta/120)), "units")
+        return charts
+    
+    @property
+    def current_figures(self):
+        """Figures of the charts in the visualization panel (charts not rendered yet are drawn now)"""
+        figures = [chart.get_figure() for chart in self.current_charts]
+        self.figure_registry.evict()
+        return figures
+    
+    def analysis_snapshot(self, charts=True, class_statistics=False, detach_figures=True, dpi=150):
+        """Everything the report and export jobs read, copied on the main thread
+        
+        A copy-on-write view of the data, the analysis results, optionally
+        the class statistics, and the current charts as titles plus figures
+        (charts not drawn yet are drawn now). With detach_figures the figures
+        are pickled copies (see snapshot_figures), so a background job never
+        touches live figures and an analysis started meanwhile cannot change
+        what it writes.
+        """
+        snapshot = {"data": self.data.copy(deep=False), "results": dict(self.analysis_results or {}),
+                    "titles": [], "figures": []}
+        if class_statistics and "Class" in self.data.columns:
+            subject_columns = snapshot["results"].get("subject_columns") or self.get_subject_columns()
+            snapshot["class_statistics"] = self.get_class_statistics(subject_columns)
+        if charts and getattr(self, 'current_charts', None):
+            figures = self.current_figures
+            snapshot["titles"] = [chart.title for chart in self.current_charts]
+            snapshot["figures"] = snapshot_figures(figures, dpi) if detach_figures else figures
+        return snapshot
+    
+    @traced("show charts")
+    def show_figures(self, analysis_type, charts):
+        """Show LazyCharts in the scrollable visualization panel, rendering them as they are needed"""
+        # Clear visualization panel
+        for widget in self.visual_frame.winfo_children():
+            widget.destroy()
+        
+        # Create a main frame to hold all charts
+        main_canvas = tk.Canvas(self.visual_frame)
+        scrollbar_v = ttk.Scrollbar(self.visual_frame, orient="vertical", command=main_canvas.yview)
+        scrollbar_h = ttk.Scrollbar(self.visual_frame, orient="horizontal", command=main_canvas.xview)
+        scrollable_frame = ttk.Frame(main_canvas)
+
+        scrollable_frame.bind(
+            "<Configure>",
+            lambda e: main_canvas.configure(scrollregion=main_canvas.bbox("all"))
+        )
+
+        main_canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+
+        # Position horizontal scrollbar at bottom of visualization interface
+        main_canvas.pack(side="top", fill="both", expand=True)
+        scrollbar_h.pack(side=tk.BOTTOM, fill=tk.X)
+        scrollbar_v.pack(side=tk.RIGHT, fill=tk.Y)
         
-        main_canvas.bind_all("<MouseWheel>", _on_mousewheel)
+        # Placeholder frames now, charts rendered when scrolled into view or from the idle queue
+        self.figure_registry.show(charts)
+        panel = LazyChartPanel(self.root, main_canvas, scrollable_frame, charts,
+                               on_render=self.figure_registry.evict)
         
-        # Save first chart for export (for compatibility)
-        if self.current_figures:
-            self.current_fig = self.current_figures[0]
+        def on_yscroll(first, last):
+            scrollbar_v.set(first, last)
+            panel.on_scroll()
+        
+        main_canvas.configure(yscrollcommand=on_yscroll, xscrollcommand=scrollbar_h.set)
+        
+        # Store all charts for export
+        self.current_charts = charts
+        self.current_analysis_type = analysis_type  # Mark analysis type
+        
+        # Bind mouse wheel event, only acting while the pointer is over the charts
+        def _on_mousewheel(event):
+            widget = self.root.winfo_containing(event.x_root, event.y_root)
+            if widget is None or not str(widget).startswith(str(main_canvas)):
+                return
+            # Button-4 / positive delta scrolls up (Linux, Windows and macOS deltas differ in size)
+            main_canvas.yview_scroll(-1 if event.num == 4 or event.delta > 0 else 1, "units")
+        
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            main_canvas.bind_all(sequence, _on_mousewheel)
         
         # Switch to visualization tab
         self.notebook.select(self.visual_frame)
 
-if __name__ == "__main__":
+def load_generator_config(config_path):
+    """Load SUBJECTS/CLASSES configuration from a JSON file"""
+    import json
+    
+    with open(config_path, encoding="utf-8") as f:
+        config = json.load(f)
+    return config.get("subjects", SUBJECTS), config.get("classes", CLASSES)
+
+
+def run_generate_command(args):
+    """Generate student data without the GUI (command line)"""
+    subjects, classes = (SUBJECTS, CLASSES) if args.config is None else load_generator_config(args.config)
+    if args.subjects:
+        subjects = [subj for subj in subjects if subj["name"] in args.subjects]
+        if not subjects:
+            raise SystemExit("None of the requested subjects are configured")
+    
+    generator = StudentDataGenerator()
+    settings = dict(id_prefix=args.id_prefix, class_range=args.class_range,
+                    subjects=subjects, classes=classes, seed=args.seed)
+    progress = lambda n: print(f"Generated {n}/{args.count} records", flush=True)
+    start_time = datetime.now()
+    if args.partitioned:
+        paths = generator.generate_partitioned(
+            args.output, args.count, chunk_size=args.chunk_size, workers=args.workers,
+            file_format=args.format, progress=progress, **settings)
+        result = f"{len(paths)} files in {args.output}"
+    else:
+        generator.stream_to_file(
+            args.output, args.count, chunk_size=args.chunk_size, workers=args.workers,
+            progress=progress, **settings)
+        result = args.output
+    elapsed = (datetime.now() - start_time).total_seconds()
+    print(f"Wrote {args.count} student records to {result} in {elapsed:.1f}s")
+
+
+def _report_file(file_path, output_dir, analysis_type, cards=None, stem=None):
+    """Analyze one grade file and write its PDF report, statistics workbook and optionally report cards (in a worker process)
+    
+    Output files are named after stem (default the file name without extension).
+    """
+    stem = stem or os.path.splitext(os.path.basename(file_path))[0]
+    result = {"file": file_path, "pdf": os.path.join(output_dir, f"{stem}_report.pdf"),
+              "workbook": os.path.join(output_dir, f"{stem}_statistics.xlsx"), "timings": {}}
+    start = last = time.perf_counter()
+    
+    def phase(name):
+        nonlocal last
+        now = time.perf_counter()
+        result["timings"][name] = round(now - last, 3)
+        last = now
+    
+    app = StudentGradeAnalysisSystem(None)
+    try:
+        app.load_file(file_path)
+        result["records"] = len(app.data)
+        phase("load")
+        app.use_statistics(app.compute_basic_statistics())
+        phase("statistics")
+        charts = app.build_figures(analysis_type)
+        for chart in charts:
+            chart.get_figure()
+        phase("charts")
+        app.write_pdf_report(result["pdf"], chart_workers=1)
+        phase("pdf")
+        app.write_statistics_file(result["workbook"])
+        phase("workbook")
+        if cards:
+            result["cards"] = os.path.join(output_dir, f"{stem}_report_cards" + ("" if cards == "per-student" else ".pdf"))
+            ReportCards(app.data, app.get_subject_columns()).write(result["cards"], cards == "per-student", workers=1)
+            phase("cards")
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        for chart in getattr(app, 'current_charts', []):
+            if chart.figure is not None:
+                plt.close(chart.figure)
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def find_grade_files(inputs):
+    """Grade files (CSV/Excel) named by a list of files, directories and glob patterns, sorted and de-duplicated"""
+    import glob
+    
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = [os.path.join(item, name) for name in os.listdir(item)]
+        else:
+            matches = glob.glob(item)
+        files.extend(path for path in matches
+                     if os.path.isfile(path) and path.lower().endswith(('.csv', '.xlsx', '.xls')))
+    return sorted(set(os.path.normpath(path) for path in files))
+
+
+def report_stems(files):
+    """Unique output name stems for grade files
+    
+    The file name without extension; files that share it keep their extension
+    (grades_csv, grades_xlsx), and if that is still ambiguous the path relative
+    to the files' common directory (s1_grades_csv). Remaining clashes are numbered.
+    """
+    paths = [os.path.abspath(path) for path in files]
+    common = os.path.commonpath(paths) if len(paths) > 1 else ""
+    candidates = [
+        lambda path: os.path.splitext(os.path.basename(path))[0],
+        lambda path: re.sub(r'[\\/.]+', '_', os.path.basename(path)),
+        lambda path: re.sub(r'[\\/.]+', '_', os.path.relpath(path, common))
+    ]
+    stems = [candidates[0](path) for path in paths]
+    for candidate in candidates[1:]:
+        counts = Counter(stems)
+        stems = [candidate(path) if counts[stem] > 1 else stem for path, stem in zip(paths, stems)]
+    
+    seen = Counter()
+    unique = []
+    for stem in stems:
+        seen[stem] += 1
+        unique.append(f"{stem}_{seen[stem]}" if seen[stem] > 1 else stem)
+    return unique
+
+
+def run_report_command(args):
+    """Write a PDF report and statistics workbook for every grade file without the GUI (command line)"""
+    import json
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    files = find_grade_files(args.inputs)
+    if not files:
+        raise SystemExit("No CSV or Excel files found")
+    os.makedirs(args.output, exist_ok=True)
+    workers = min(args.workers or os.cpu_count() or 1, len(files))
+    
+    started = datetime.now()
+    start = time.perf_counter()
+    results = []
+    
+    def report(result):
+        results.append(result)
+        status = f"failed ({result['error']})" if "error" in result else f"{result['seconds']:.1f}s"
+        print(f"[{len(results)}/{len(files)}] {result['file']}: {status}", flush=True)
+    
+    # Files with the same name (e.g. grades.csv and grades.xlsx) must not overwrite each other's outputs
+    stems = report_stems(files)
+    if workers <= 1:
+        _init_render_worker()
+        for file_path, stem in zip(files, stems):
+            report(_report_file(file_path, args.output, args.analysis, args.cards, stem))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker) as executor:
+            futures = [executor.submit(_report_file, file_path, args.output, args.analysis, args.cards, stem)
+                       for file_path, stem in zip(files, stems)]
+            for future in as_completed(futures):
+                report(future.result())
+    
+    results.sort(key=lambda result: result["file"])
+    failed = sum("error" in result for result in results)
+    summary = {
+        "started": started.isoformat(timespec="seconds"),
+        "seconds": round(time.perf_counter() - start, 3),
+        "workers": workers,
+        "analysis": args.analysis,
+        "files": results,
+        "failed": failed
+    }
+    summary_path = os.path.join(args.output, "report_summary.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    
+    print(f"Reported {len(files) - failed}/{len(files)} files in {summary['seconds']:.1f}s, summary in {summary_path}")
+    if failed:
+        raise SystemExit(1)
+
+
+def measure(stages, name, function, trace_memory=False, repeat=1, setup=None):
+    """Run function repeat times as benchmark stage name, recording the best wall time and peak memory
+    
+    setup (untimed) runs before every repetition. Memory is the tracemalloc peak of the stage (peak_mb, with trace_memory)
+    and the process-wide high-water mark reached by the end of the stage (process_max_rss_mb, ru_maxrss). The latter is
+    cumulative over the whole run, so it only grows from stage to stage. Returns the last result.
+    """
+    import tracemalloc
+    
+    best = None
+    peak = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - started
+        if trace_memory:
+            peak = max(peak or 0, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        best = seconds if best is None else min(best, seconds)
+    
+    stages[name] = {"seconds": round(best, 4)}
+    if peak is not None:
+        stages[name]["peak_mb"] = round(peak / 1024 ** 2, 2)
+    try:
+        import resource
+        # ru_maxrss is in KB on Linux and in bytes on macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        stages[name]["process_max_rss_mb"] = round(rss / (1024 ** 2 if os.uname().sysname == "Darwin" else 1024), 2)
+    except ImportError:
+        pass
+    print(f"  {name:<24}{best:9.3f}s", flush=True)
+    return result
+
+
+def benchmark_size(count, work_dir, trace_memory=False, repeat=1, xlsx_max=100000, seed=0):
+    """Benchmark every stage (generate, import, analyses, table, PDF) on a generated cohort of count students"""
+    stages = {}
+    def run(name, function, setup=None):
+        # A failing stage is recorded and the remaining stages still run
+        try:
+            return measure(stages, name, function, trace_memory, repeat, setup)
+        except Exception as e:
+            stages[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"  {name:<24}  failed ({stages[name]['error']})", flush=True)
+    
+    data = run("generate_data", lambda: StudentDataGenerator().generate_shard(0, count, count, seed=seed))
+    if data is None:
+        # Every other stage works on the generated data
+        stages["remaining_stages"] = {"skipped": "generate_data failed"}
+        print("  remaining stages skipped (generate_data failed)", flush=True)
+        return stages
+    
+    # Import as import_data does: parse (and fill the binary cache), then compact; a second import hits the cache
+    formats = ["csv"] + (["xlsx"] if count <= xlsx_max else [])
+    for file_format in formats:
+        file_path = os.path.join(work_dir, f"students_{count}.{file_format}")
+        if file_format == "csv":
+            data.to_csv(file_path, index=False)
+        else:
+            data.to_excel(file_path, index=False)
+        cache = ImportCache(os.path.join(work_dir, f"cache_{count}_{file_format}"))
+        run(f"import_{file_format}", lambda: compact_dtypes(cache.load(file_path)), setup=cache.clear)
+        run(f"import_{file_format}_cached", lambda: compact_dtypes(cache.load(file_path)))
+    
+    app = StudentGradeAnalysisSystem(None)
+    app.data, _, _ = compact_dtypes(data)
+    app.mark_data_changed()
+    
+    def close_charts():
+        for chart in getattr(app, 'current_charts', []):
+            if chart.figure is not None:
+                plt.close(chart.figure)
+                chart.figure = None
+    
+    def analysis(analysis_type):
+        # Fresh data version, so nothing is served from the analysis cache
+        close_charts()
+        app.mark_data_changed()
+        charts = app.build_figures(analysis_type)
+        for chart in charts:
+            chart.get_figure()
+        return charts
+    
+    def basic_analysis():
+        app.mark_data_changed()
+        app.use_statistics(app.compute_basic_statistics())
+    
+    run("basic_analysis", basic_analysis)
+    run("subject_analysis", lambda: analysis('subject'))
+    run("advanced_analysis", lambda: analysis('advanced'))
+    run("distribution_analysis", lambda: analysis('distribution'))
+    
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        stages["update_table"] = {"skipped": "no display"}
+        print(f"  {'update_table':<24}  skipped (no display)", flush=True)
+    else:
+        root.withdraw()
+        tree = ttk.Treeview(root)
+        table = VirtualTable(tree, ttk.Scrollbar(root))
+        
+        def update_table():
+            table.set_data(app.data)
+            # Scroll through the table page by page as a user would
+            for first in range(0, len(app.data), max(1, len(app.data) // 100)):
+                table.scroll_to(first)
+            root.update_idletasks()
+        
+        run("update_table", update_table)
+        root.destroy()
+    
+    run("generate_pdf_report", lambda: app.write_pdf_report(os.path.join(work_dir, f"report_{count}.pdf")))
+    close_charts()
+    return stages
+
+
+def compare_benchmarks(results, baseline, tolerance):
+    """Stages that got slower than baseline by more than the tolerance factor, as printable lines"""
+    regressions = []
+    for size, stages in results.items():
+        for name, stage in stages.items():
+            old = baseline.get(size, {}).get(name, {})
+            if "seconds" not in stage or not old.get("seconds"):
+                continue
+            ratio = stage["seconds"] / old["seconds"]
+            stage["baseline_seconds"] = old["seconds"]
+            stage["ratio"] = round(ratio, 3)
+            if ratio > tolerance:
+                regressions.append(f"{size} students, {name}: {old['seconds']:.3f}s -> {stage['seconds']:.3f}s "
+                                   f"({ratio:.2f}x)")
+    return regressions
+
+
+def run_benchmark_command(args):
+    """Benchmark generation, import, analyses, table and PDF report across dataset sizes (command line)"""
+    import json
+    import platform
+    
+    _init_render_worker()
+    work_dir = tempfile.mkdtemp(prefix="grade_benchmark_")
+    results = {}
+    try:
+        for count in args.sizes:
+            print(f"{count} students:", flush=True)
+            results[str(count)] = benchmark_size(count, work_dir, args.trace_memory, args.repeat, args.xlsx_max, args.seed)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_benchmarks(results, json.load(f)["results"], args.tolerance)
+    
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "versions": {package: getattr(importlib.import_module(package), "__version__", None)
+                     for package in ("numpy", "pandas", "matplotlib", "seaborn", "reportlab")},
+        "settings": {"repeat": args.repeat, "trace_memory": args.trace_memory, "seed": args.seed},
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+    
+    if args.baseline:
+        if regressions:
+            print(f"{len(regressions)} stage(s) slower than {args.baseline} by more than {args.tolerance:.2f}x:")
+            for line in regressions:
+                print(f"  {line}")
+            raise SystemExit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+def main(argv=None):
+    """Program entry point: start the GUI, or run a command line tool"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Student Grade Analysis System")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Print when the window is painted and what each deferred import costs")
+    commands = parser.add_subparsers(dest="command")
+    
+    gen_parser = commands.add_parser("generate", help="Generate student data without the GUI")
+    gen_parser.add_argument("-n", "--count", type=int, required=True, help="Number of students")
+    gen_parser.add_argument("-o", "--output", required=True, help="Output file (.csv or .parquet), or directory")
+    gen_parser.add_argument("--chunk-size", type=int, default=100000, help="Records generated per chunk")
+    gen_parser.add_argument("--id-prefix", default="2023", help="Student ID prefix")
+    gen_parser.add_argument("--class-range", default="Random Assignment", help="Class name, or 'Random Assignment'")
+    gen_parser.add_argument("--subjects", nargs="+", help="Only generate these subjects")
+    gen_parser.add_argument("--config", help="JSON file with 'subjects' and/or 'classes' lists")
+    gen_parser.add_argument("--seed", type=int, help="Random seed for reproducible data")
+    gen_parser.add_argument("--workers", type=int, default=1, help="Worker processes, each given at least 500000 records (output does not depend on this)")
+    gen_parser.add_argument("--partitioned", action="store_true",
+                            help="Treat --output as a directory and write one file per chunk")
+    gen_parser.add_argument("--format", choices=["csv", "parquet"], default="csv",
+                            help="File format for --partitioned output")
+    
+    report_parser = commands.add_parser("report", help="Write PDF reports and statistics workbooks without the GUI")
+    report_parser.add_argument("inputs", nargs="+", help="Grade files (CSV/Excel), directories or glob patterns")
+    report_parser.add_argument("-o", "--output", required=True, help="Output directory")
+    report_parser.add_argument("--analysis", choices=["subject", "distribution", "advanced"], default="distribution",
+                               help="Analysis whose charts go into the reports")
+    report_parser.add_argument("--cards", choices=["merged", "per-student"],
+                               help="Also write student report cards (one merged PDF or one file per student)")
+    report_parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    
+    bench_parser = commands.add_parser("benchmark", help="Measure speed and memory across dataset sizes (headless)")
+    bench_parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000],
+                              help="Numbers of students to benchmark")
+    bench_parser.add_argument("-o", "--output", default="benchmark_results.json", help="JSON results file")
+    bench_parser.add_argument("--baseline", help="Earlier results file to compare against")
+    bench_parser.add_argument("--tolerance", type=float, default=1.2,
+                              help="Report stages slower than the baseline by more than this factor")
+    bench_parser.add_argument("--repeat", type=int, default=1, help="Runs per stage (the fastest counts)")
+    bench_parser.add_argument("--trace-memory", action="store_true",
+                              help="Record each stage's peak allocations with tracemalloc (slower)")
+    bench_parser.add_argument("--xlsx-max", type=int, default=100000, help="Largest size also imported as XLSX")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Random seed of the generated data")
+    
+    args = parser.parse_args(argv)
+    if args.command == "generate":
+        if args.count < 0:
+            gen_parser.error("--count must not be negative")
+        if args.chunk_size <= 0:
+            gen_parser.error("--chunk-size must be greater than 0")
+        run_generate_command(args)
+        return
+    if args.command == "report":
+        run_report_command(args)
+        return
+    if args.command == "benchmark":
+        run_benchmark_command(args)
+        return
+    
     root = tk.Tk()
     app = StudentGradeAnalysisSystem(root)
-    root.mainloop()
\ No newline at end of file
+    
+    # Paint the window first, then import the heavy modules in the background
+    root.update()
+    painted = time.perf_counter() - STARTUP_TIME
+    on_done = (lambda: print(startup_report(painted), flush=True)) if args.startup_profile else None
+    preload_modules(on_done)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file